@@ -3,29 +3,65 @@ import json
 import time
 import uuid
 import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from tabulate import tabulate
 from cryptography.hazmat.primitives.asymmetric import rsa, padding
 from cryptography.hazmat.primitives import hashes, serialization
 from cryptography.hazmat.primitives.serialization import Encoding, PrivateFormat, PublicFormat, NoEncryption
 from cryptography.exceptions import InvalidSignature
+from rsa_toolkit import envelope
+from rsa_toolkit.gradebook import MemoryGradebook, SQLiteGradebook
+from rsa_toolkit.keystore import KeyPool, KeyStore
+from rsa_toolkit.pubkeys import PublicKeyCache, fingerprint
+
+# Parsed public keys shared by every participant, keyed by PEM fingerprint
+PUBLIC_KEY_CACHE = PublicKeyCache()
 
 class Person:
-    """Base class for both students and instructors."""
-    def __init__(self, name):
+    """
+    Base class for both students and instructors.
+    
+    Without a keystore the key pair is generated right away. With one, the
+    key is looked up under key_id (default: the name) on first use, and taken
+    from key_pool if the store does not have it yet.
+    """
+    def __init__(self, name, keystore=None, key_pool=None, key_id=None):
         self.name = name
-        self.private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048
-        )
-        self.public_key = self.private_key.public_key()
+        self.keystore = keystore
+        self.key_pool = key_pool
+        self.key_id = key_id or name
+        self._private_key = None
+        self._public_key = None
+        self._public_key_pem = None
+        if keystore is None:
+            self._private_key = rsa.generate_private_key(
+                public_exponent=65537,
+                key_size=2048
+            )
+    
+    @property
+    def private_key(self):
+        """The private key, loaded from the keystore the first time it is needed."""
+        if self._private_key is None:
+            self._private_key = self.keystore.get_or_create(self.key_id, self.key_pool)
+        return self._private_key
+    
+    @property
+    def public_key(self):
+        if self._public_key is None:
+            self._public_key = self.private_key.public_key()
+        return self._public_key
     
     def get_public_key_pem(self):
         """Export public key in PEM format."""
-        return self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
+        if self._public_key_pem is None:
+            self._public_key_pem = self.public_key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+        return self._public_key_pem
     
     def sign_message(self, message):
         """Sign a message (bytes or string) with private key."""
@@ -43,7 +79,7 @@ class Person:
     
     def verify_signature(self, message, signature, public_key_pem):
         """Verify signature using a public key."""
-        public_key = serialization.load_pem_public_key(public_key_pem)
+        public_key = PUBLIC_KEY_CACHE.get(public_key_pem)
         if isinstance(message, str):
             message = message.encode('utf-8')
         try:
@@ -60,12 +96,24 @@ class Person:
         except InvalidSignature:
             return False
     
-    def encrypt_message(self, message, recipient_public_key_pem):
-        """Encrypt a message for another party using their public key."""
-        recipient_public_key = serialization.load_pem_public_key(recipient_public_key_pem)
+    def encrypt_message(self, message, recipient_public_key_pem, use_envelope=None):
+        """
+        Encrypt a message for another party using their public key.
+        
+        Messages that do not fit in one RSA-OAEP block (about 190 bytes for a
+        2048-bit key) are sealed in an RSA-OAEP + AES-GCM envelope instead;
+        use_envelope=True/False forces either mode.
+        """
+        recipient_public_key = PUBLIC_KEY_CACHE.get(recipient_public_key_pem)
         if isinstance(message, str):
             message = message.encode('utf-8')
         
+        # OAEP with SHA-256 spends 2 * 32 + 2 bytes of the modulus on padding
+        if use_envelope is None:
+            use_envelope = len(message) > recipient_public_key.key_size // 8 - 66
+        if use_envelope:
+            return envelope.seal(message, recipient_public_key)
+        
         ciphertext = recipient_public_key.encrypt(
             message,
             padding.OAEP(
@@ -77,7 +125,10 @@ class Person:
         return ciphertext
     
     def decrypt_message(self, ciphertext):
-        """Decrypt a message encrypted with this person's public key."""
+        """Decrypt a message (plain RSA-OAEP or envelope) encrypted with this person's public key."""
+        # A plain OAEP ciphertext is exactly one modulus long, an envelope is always longer
+        if len(ciphertext) > self.private_key.key_size // 8 and envelope.is_envelope(ciphertext):
+            return envelope.open_envelope(ciphertext, self.private_key)
         plaintext = self.private_key.decrypt(
             ciphertext,
             padding.OAEP(
@@ -87,17 +138,25 @@ class Person:
             )
         )
         return plaintext
+    
+    def encrypt_file(self, src_path, dst_path, recipient_public_key_pem):
+        """Seal a file of any size (PDF, archive, ...) for another party, streaming it."""
+        return envelope.seal_file(src_path, dst_path, PUBLIC_KEY_CACHE.get(recipient_public_key_pem))
+    
+    def decrypt_file(self, src_path, dst_path):
+        """Open a file sealed for this person with encrypt_file."""
+        return envelope.open_file(src_path, dst_path, self.private_key)
 
 class Student(Person):
-    def __init__(self, name, student_id):
-        super().__init__(name)
+    def __init__(self, name, student_id, keystore=None, key_pool=None):
+        super().__init__(name, keystore=keystore, key_pool=key_pool, key_id=student_id)
         self.student_id = student_id
         self.anonymous_id = None
         self.submissions = []
         self.grades = {}
     
-    def request_anonymous_id(self, instructor):
-        """Request an anonymous ID from the instructor."""
+    def build_anonymous_id_request(self):
+        """Signed anonymous ID request: (request_json, signature, public_key_pem)."""
         timestamp = datetime.now().isoformat()
         request_data = {
             "student_id": self.student_id,
@@ -110,20 +169,24 @@ class Student(Person):
         
         # Sign the request
         signature = self.sign_message(request_json)
+        return request_json, signature, self.get_public_key_pem()
+    
+    def request_anonymous_id(self, instructor):
+        """Request an anonymous ID from the instructor."""
+        request = self.build_anonymous_id_request()
         
         # Send the request to the instructor
         print(f"\n[Student {self.name}] Requesting anonymous ID...")
-        response = instructor.process_anonymous_id_request(
-            request_json, 
-            signature, 
-            self.get_public_key_pem()
-        )
-        
+        response = instructor.process_anonymous_id_request(*request)
+        return self.accept_anonymous_id(response, instructor.get_public_key_pem())
+    
+    def accept_anonymous_id(self, response, instructor_public_key_pem):
+        """Check and decrypt the instructor's answer to an anonymous ID request."""
         if response:
             encrypted_aid, instructor_signature = response
             
             # Verify instructor's signature
-            if self.verify_signature(encrypted_aid, instructor_signature, instructor.get_public_key_pem()):
+            if self.verify_signature(encrypted_aid, instructor_signature, instructor_public_key_pem):
                 # Decrypt the anonymous ID
                 aid_bytes = self.decrypt_message(encrypted_aid)
                 self.anonymous_id = aid_bytes.decode('utf-8')
@@ -163,26 +226,29 @@ class Student(Person):
         self.submissions.append(submission)
         return submission
     
-    def submit_work(self, instructor, content):
-        """Submit work to the instructor."""
+    def build_submission(self, content):
+        """Signed submission ready to send: (submission_str, signature, public_key_pem), or None."""
         if not self.anonymous_id:
             print(f"[Student {self.name}] Cannot submit without an anonymous ID!")
-            return False
+            return None
         
         submission = self.create_submission(content)
         if not submission:
-            return False
+            return None
         
         # Convert submission to JSON for sending
         submission_str = json.dumps(submission["data"], sort_keys=True)
         signature = base64.b64decode(submission["signature"])
+        return submission_str, signature, self.get_public_key_pem()
+    
+    def submit_work(self, instructor, content):
+        """Submit work to the instructor."""
+        request = self.build_submission(content)
+        if request is None:
+            return False
         
         print(f"\n[Student {self.name}] Submitting work anonymously...")
-        result = instructor.receive_submission(
-            submission_str,
-            signature,
-            self.get_public_key_pem()
-        )
+        result = instructor.receive_submission(*request)
         
         if result:
             print(f"[Student {self.name}] Work submitted successfully with anonymous ID: {self.anonymous_id}")
@@ -208,25 +274,32 @@ class Student(Person):
             return None
 
 class Instructor(Person):
-    def __init__(self, name):
-        super().__init__(name)
-        # Maps student_id -> public_key_pem
-        self.registered_students = {}
-        # Maps student_id -> anonymous_id
-        self.student_aid_map = {}
-        # Maps anonymous_id -> student_id (reverse lookup)
-        self.aid_student_map = {}
-        # Maps anonymous_id -> {submission, grade}
-        self.submissions = {}
-        # Maps anonymous_id -> grade (published)
-        self.published_grades = {}
+    def __init__(self, name, keystore=None, key_pool=None, gradebook=None):
+        super().__init__(name, keystore=keystore, key_pool=key_pool)
+        # Registrations, anonymous IDs, submissions and grades (in memory unless
+        # a persistent gradebook such as SQLiteGradebook is given)
+        self.gradebook = gradebook if gradebook is not None else MemoryGradebook()
+        self.registered_students = self.gradebook.registered_students
+        self.student_aid_map = self.gradebook.student_aid_map
+        self.aid_student_map = self.gradebook.aid_student_map
+        self.submissions = self.gradebook.submissions
+        self.published_grades = self.gradebook.published_grades
+        # Guards the submission maps against concurrent intake
+        self._lock = threading.Lock()
     
     def register_student(self, student_id, public_key_pem):
-        """Register a student with their public key."""
-        self.registered_students[student_id] = public_key_pem
+        """Register a student with their public key (stored as its fingerprint)."""
+        self.registered_students[student_id] = fingerprint(public_key_pem)
         print(f"[Instructor {self.name}] Registered student: {student_id}")
         return True
     
+    def register_students(self, registrations):
+        """Register many (student_id, public_key_pem) pairs in one batch; returns the count."""
+        fingerprints = {student_id: fingerprint(public_key_pem) for student_id, public_key_pem in registrations}
+        self.registered_students.update(fingerprints)
+        print(f"[Instructor {self.name}] Registered {len(fingerprints)} students in a batch")
+        return len(fingerprints)
+    
     def process_anonymous_id_request(self, request_json, signature, public_key_pem):
         """Process a request for an anonymous ID."""
         # Verify the signature
@@ -244,7 +317,7 @@ class Instructor(Person):
             self.register_student(student_id, public_key_pem)
         
         # Verify the public key matches the registered one
-        if self.registered_students[student_id] != public_key_pem:
+        if self.registered_students[student_id] != fingerprint(public_key_pem):
             print(f"[Instructor] Public key mismatch for student {student_id}!")
             return None
         
@@ -252,8 +325,7 @@ class Instructor(Person):
         anonymous_id = str(uuid.uuid4())
         
         # Store the mapping
-        self.student_aid_map[student_id] = anonymous_id
-        self.aid_student_map[anonymous_id] = student_id
+        self.gradebook.issue_anonymous_id(student_id, anonymous_id)
         
         # Encrypt the anonymous ID with the student's public key
         encrypted_aid = self.encrypt_message(anonymous_id, public_key_pem)
@@ -264,15 +336,25 @@ class Instructor(Person):
         print(f"[Instructor {self.name}] Issued anonymous ID for student {student_id}")
         return (encrypted_aid, instructor_signature)
     
-    def receive_submission(self, submission_str, signature, public_key_pem):
-        """Receive and verify a submission."""
-        # Verify the signature
-        if not self.verify_signature(submission_str, signature, public_key_pem):
-            print("[Instructor] Invalid signature on submission!")
-            return False
-        
-        # Parse the submission
-        submission = json.loads(submission_str)
+    def _verify_submission(self, submission_str, signature, public_key_pem):
+        """Check the signature and parse a submission; returns the submission dict or None."""
+        try:
+            if not self.verify_signature(submission_str, signature, public_key_pem):
+                print("[Instructor] Invalid signature on submission!")
+                return None
+            submission = json.loads(submission_str)
+            anonymous_id = submission["anonymous_id"]
+        except (ValueError, KeyError, TypeError) as e:
+            # Bad JSON, a bad key, or JSON that is not a submission object
+            print(f"[Instructor] Malformed submission: {e!r}")
+            return None
+        if not isinstance(anonymous_id, str):
+            print(f"[Instructor] Malformed anonymous ID: {anonymous_id!r}")
+            return None
+        return submission
+    
+    def _accept_submission(self, submission, public_key_pem):
+        """Check that a verified submission comes from the student holding its anonymous ID."""
         anonymous_id = submission["anonymous_id"]
         
         # Check if the anonymous ID is valid
@@ -284,37 +366,87 @@ class Instructor(Person):
         student_id = self.aid_student_map[anonymous_id]
         
         # Verify the public key matches the registered one for this student
-        if self.registered_students[student_id] != public_key_pem:
+        if self.registered_students[student_id] != fingerprint(public_key_pem):
             print(f"[Instructor] Public key mismatch for anonymous ID: {anonymous_id}")
             return False
-        
-        # Store the submission
-        self.submissions[anonymous_id] = {
+        return True
+    
+    def _submission_record(self, submission, signature):
+        return {
             "submission": submission,
             "grade": None,
             "signature": base64.b64encode(signature).decode('utf-8')
         }
+    
+    def receive_submission(self, submission_str, signature, public_key_pem):
+        """Receive and verify a submission."""
+        # Verify the signature and parse the submission
+        submission = self._verify_submission(submission_str, signature, public_key_pem)
+        if submission is None:
+            return False
+        
+        with self._lock:
+            if not self._accept_submission(submission, public_key_pem):
+                return False
+            
+            # Store the submission
+            anonymous_id = submission["anonymous_id"]
+            self.submissions[anonymous_id] = self._submission_record(submission, signature)
         
         print(f"[Instructor {self.name}] Received anonymous submission with ID: {anonymous_id}")
         return True
     
+    def receive_submissions(self, batch, max_workers=None):
+        """
+        Receive many (submission_str, signature, public_key_pem) tuples at once.
+        
+        Signatures are verified on a thread pool (OpenSSL releases the GIL),
+        then every accepted submission is committed in one step under the
+        instructor's lock. Returns one True/False per item, in input order;
+        a malformed item is rejected on its own.
+        """
+        batch = list(batch)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            verified = list(executor.map(lambda item: self._verify_submission(*item), batch))
+        
+        results = []
+        accepted = {}
+        with self._lock:
+            for (_, signature, public_key_pem), submission in zip(batch, verified):
+                try:
+                    ok = submission is not None and self._accept_submission(submission, public_key_pem)
+                except (ValueError, KeyError, TypeError) as e:
+                    # One inconsistent record must not cost the rest of the batch
+                    print(f"[Instructor] Rejected submission: {e!r}")
+                    ok = False
+                if ok:
+                    accepted[submission["anonymous_id"]] = self._submission_record(submission, signature)
+                results.append(ok)
+            self.submissions.update(accepted)
+        
+        print(f"[Instructor {self.name}] Received {len(accepted)} of {len(batch)} anonymous submissions in a batch")
+        return results
+    
     def grade_submission(self, anonymous_id, grade):
         """Grade a submission by its anonymous ID."""
-        if anonymous_id not in self.submissions:
+        if not self.gradebook.set_grade(anonymous_id, grade):
             print(f"[Instructor] No submission found for anonymous ID: {anonymous_id}")
             return False
         
-        self.submissions[anonymous_id]["grade"] = grade
         print(f"[Instructor {self.name}] Graded submission {anonymous_id} with grade: {grade}")
         return True
     
+    def grade_submissions(self, grades):
+        """Grade many (anonymous_id, grade) pairs in one batch; returns the number graded."""
+        graded = self.gradebook.set_grades(grades)
+        print(f"[Instructor {self.name}] Graded {graded} submissions in a batch")
+        return graded
+    
     def publish_grades(self):
         """Publish all grades."""
-        for aid, submission_data in self.submissions.items():
-            if submission_data["grade"] is not None:
-                self.published_grades[aid] = submission_data["grade"]
+        published = self.gradebook.publish()
         
-        print(f"[Instructor {self.name}] Published grades for {len(self.published_grades)} submissions")
+        print(f"[Instructor {self.name}] Published grades for {published} submissions")
         return self.published_grades
     
     def get_published_grades(self):
@@ -324,31 +456,59 @@ class Instructor(Person):
     def get_final_grades_with_names(self):
         """Get the final grades with student IDs (for instructor records)."""
         final_grades = {}
-        for aid, grade in self.published_grades.items():
-            if aid in self.aid_student_map:
-                student_id = self.aid_student_map[aid]
-                final_grades[student_id] = {
-                    "anonymous_id": aid,
-                    "grade": grade
-                }
+        for student_id, aid, grade in self.gradebook.iter_final_grades():
+            final_grades[student_id] = {
+                "anonymous_id": aid,
+                "grade": grade
+            }
         return final_grades
 
-def run_simulation():
-    """Run a simulation of the anonymous submission protocol."""
+def create_students(roster, keystore, key_pool=None):
+    """
+    Create Students for (name, student_id) pairs without waiting for key generation.
+    
+    Every student without a stored key is handed one from key_pool (a file
+    move) while the pool lasts; nobody waits for a key to be generated here.
+    Students left without a key get one on first use, and keys are only
+    parsed when a student first signs or decrypts.
+    """
+    roster = list(roster)
+    assigned = keystore.assign_many((student_id for _, student_id in roster), key_pool)
+    pending = sum(student_id not in keystore for _, student_id in roster)
+    print(f"[Keystore] Assigned {assigned} new keys for {len(roster)} students ({pending} deferred to first use)")
+    return [Student(name, student_id, keystore=keystore, key_pool=key_pool) for name, student_id in roster]
+
+def run_simulation(keystore_dir=None, gradebook_path=None):
+    """
+    Run a simulation of the anonymous submission protocol.
+    
+    With keystore_dir, keys are kept in (and reused from) keystore_dir/keys,
+    with a pre-generated pool in keystore_dir/pool. With gradebook_path, the
+    instructor's records go to an SQLite database instead of memory.
+    """
     print("\n=== ANONYMOUS SUBMISSION PROTOCOL SIMULATION ===\n")
     
-    # Create an instructor
-    instructor = Instructor("Professor Smith")
-    
-    # Create students
-    students = [
-        Student("Alice", "S12345"),
-        Student("Bob", "S23456"),
-        Student("Charlie", "S34567"),
-        Student("David", "S45678"),
-        Student("Eve", "S56789")
+    roster = [
+        ("Alice", "S12345"),
+        ("Bob", "S23456"),
+        ("Charlie", "S34567"),
+        ("David", "S45678"),
+        ("Eve", "S56789")
     ]
     
+    gradebook = SQLiteGradebook(gradebook_path) if gradebook_path else None
+    if keystore_dir is None:
+        # Create an instructor
+        instructor = Instructor("Professor Smith", gradebook=gradebook)
+        
+        # Create students
+        students = [Student(name, student_id) for name, student_id in roster]
+    else:
+        keystore = KeyStore(os.path.join(keystore_dir, "keys"))
+        key_pool = KeyPool(os.path.join(keystore_dir, "pool"), target_size=2 * len(roster), low_water=len(roster))
+        instructor = Instructor("Professor Smith", keystore=keystore, key_pool=key_pool, gradebook=gradebook)
+        students = create_students(roster, keystore, key_pool)
+    
     # Register students
     print("\n--- STUDENT REGISTRATION ---")
     for student in students:
@@ -374,14 +534,15 @@ def run_simulation():
     
     # Instructor grades the submissions
     print("\n--- ANONYMOUS GRADING ---")
-    # Get anonymous IDs from the instructor's records for grading
-    anonymous_ids = list(instructor.aid_student_map.values())
+    # Grade this run's submissions by their anonymous IDs (a persistent
+    # gradebook also holds the IDs issued in earlier runs)
+    anonymous_ids = [student.anonymous_id for student in students]
     
     # Assign random grades
     grades = [85, 92, 78, 95, 88]
     
-    for i, aid in enumerate(anonymous_ids):
-        instructor.grade_submission(aid, grades[i])
+    for aid, grade in zip(anonymous_ids, grades):
+        instructor.grade_submission(aid, grade)
     
     # Instructor publishes the grades
     print("\n--- GRADE PUBLISHING ---")
@@ -406,6 +567,10 @@ def run_simulation():
     print("\nFinal Grades (Instructor's View):")
     print(tabulate(table_data, headers=["Student Name", "Student ID", "Anonymous ID", "Grade"], tablefmt="grid"))
     
+    stats = PUBLIC_KEY_CACHE.stats()
+    print(f"\nPublic key cache: {stats['hits']} hits, {stats['misses']} misses "
+          f"({stats['hit_rate']:.0%} hit rate, {stats['size']} keys cached)")
+    
     # This demonstrates that only the instructor can link anonymous IDs to real identities
     print("\n=== PROTOCOL SIMULATION COMPLETED ===\n")
     
@@ -453,6 +618,7 @@ def run_simulation():
         f.write("Final Grades with Student Identities (instructor's view only):\n")
         f.write(tabulate(table_data, headers=["Student Name", "Student ID", "Anonymous ID", "Grade"], tablefmt="grid"))
     
+    instructor.gradebook.close()
     print(f"Report saved to 'anonymous_submission_report.txt'")
 
 if __name__ == "__main__":
@@ -1,23 +1,14 @@
 import random
 import math
-from sympy import isprime, mod_inverse
+from sympy import mod_inverse
 import time
+from rsa_toolkit import arith, blocks, codebook, factorization, keygen, keys, parallel, primes, streaming
+from rsa_toolkit.metrics import print_report
 
-def generate_prime(bit_length):
+def generate_prime(bit_length, pool=None, metrics=None):
     """Generate a prime number of the specified bit length."""
-    while True:
-        # Generate a random number with the specified bit length
-        if bit_length == 2:
-            # 2-bit primes are only 2 and 3
-            return random.choice([2, 3])
-        
-        # For other bit lengths, generate random numbers until a prime is found
-        min_val = 2**(bit_length-1)
-        max_val = 2**bit_length - 1
-        candidate = random.randint(min_val, max_val)
-        
-        if isprime(candidate):
-            return candidate
+    # Odd full-length candidates, small-prime gcd prefilter, then Miller-Rabin
+    return primes.generate_prime(bit_length, pool=pool, metrics=metrics)
 
 def gcd(a, b):
     """Calculate the greatest common divisor of two numbers."""
@@ -25,15 +16,15 @@ def gcd(a, b):
         a, b = b, a % b
     return a
 
-def generate_rsa_keys(bit_length):
-    """Generate RSA key pair with primes of the specified bit length."""
+def generate_rsa_keys(bit_length, metrics=None, pool=None):
+    """Generate RSA key pair with primes of the specified bit length (drawn from a PrimePool if given)."""
     # Generate two distinct primes
-    p = generate_prime(bit_length)
-    q = generate_prime(bit_length)
+    p = generate_prime(bit_length, pool=pool, metrics=metrics)
+    q = generate_prime(bit_length, pool=pool, metrics=metrics)
     
     # Ensure p and q are different
     while p == q:
-        q = generate_prime(bit_length)
+        q = generate_prime(bit_length, pool=pool, metrics=metrics)
     
     # Calculate n and Euler's totient function
     n = p * q
@@ -73,13 +64,22 @@ def generate_rsa_keys(bit_length):
     else:
         d = mod_inverse(e, phi_n)
     
-    return (e, n), (d, n), p, q
+    # Keep p and q in the private key so decryption can use the CRT
+    return (e, n), keys.CRTPrivateKey(d, p, q), p, q
+
+def generate_rsa_key_batch(count, bit_length, workers=None, seed=None):
+    """
+    Generate `count` key pairs over a process pool, yielding each (public_key, private_key)
+    as soon as it is ready. Uses e = 65537 whenever it fits below phi(n).
+    """
+    return keygen.generate_keypairs(count, bit_length, workers=workers, seed=seed)
 
 def rsa_encrypt(message, public_key):
     """Encrypt a message using the RSA public key."""
     e, n = public_key
     # For simplicity, we'll encrypt each character separately
     encrypted = []
+    modexp = arith.modulus_context(n).pow
     for char in message:
         # Convert character to integer (ASCII value)
         m = ord(char)
@@ -89,25 +89,59 @@ def rsa_encrypt(message, public_key):
             raise ValueError(f"Message character '{char}' (value {m}) is too large for n={n}. Try with larger bit length.")
         
         # Encrypt: c = m^e mod n
-        c = pow(m, e, n)
+        c = modexp(m, e)
         encrypted.append(c)
     
     return encrypted
 
 def rsa_decrypt(encrypted, private_key):
     """Decrypt a message using the RSA private key."""
-    d, n = private_key
-    decrypted = ""
+    decrypted = []
     for c in encrypted:
-        # Decrypt: m = c^d mod n
-        m = pow(c, d, n)
+        # Decrypt: m = c^d mod n (via the CRT for CRTPrivateKey)
+        m = keys.private_decrypt(c, private_key)
         # Convert integer back to character
-        decrypted += chr(m)
+        decrypted.append(chr(m))
     
-    return decrypted
+    return "".join(decrypted)
+
+def rsa_brute_force(encrypted, public_key, engine="python"):
+    """Recover a per-character ciphertext without the private key, in a single candidate sweep."""
+    from rsa_toolkit.core import brute_force_decrypt_many
+    # Every distinct ciphertext is a target; one pow(m, e, n) per candidate serves all of them
+    found, elapsed = brute_force_decrypt_many(encrypted, public_key, engine=engine)
+    missing = [c for c in encrypted if c not in found]
+    if missing:
+        raise ValueError(f"Ciphertext {missing[0]} has no plaintext below n")
+    return "".join(chr(found[c]) for c in encrypted), elapsed
+
+def rsa_encrypt_blocks(message, public_key):
+    """Encrypt a message by packing as many bytes as fit below n into each RSA block."""
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    return blocks.encrypt_bytes(message, public_key)
+
+def rsa_decrypt_blocks(ciphertext, private_key):
+    """Decrypt a block-mode ciphertext (bytes or memoryview) back into bytes."""
+    return blocks.decrypt_bytes(ciphertext, private_key)
+
+def rsa_encrypt_file(src_path, dst_path, public_key):
+    """Encrypt a file of any size in block mode, streaming it from disk."""
+    return streaming.encrypt_file(src_path, dst_path, public_key)
+
+def rsa_decrypt_file(src_path, dst_path, private_key):
+    """Decrypt a file written by rsa_encrypt_file, streaming it from disk."""
+    return streaming.decrypt_file(src_path, dst_path, private_key)
+
+def simulate_brute_force(public_key, bit_length, workers=1, strategy="trial_division", metrics=None):
+    """
+    Simulate a brute force attack on RSA.
 
-def simulate_brute_force(public_key, bit_length):
-    """Simulate a brute force attack on RSA."""
+    strategy selects the factorization method (see factorization.STRATEGIES,
+    or "auto"). With workers > 1 the trial divisions are spread over a
+    process pool. A Metrics object, if given, counts the divisions and
+    times every factorization strategy tried.
+    """
     e, n = public_key
     
     start_time = time.time()
@@ -117,16 +151,41 @@ def simulate_brute_force(public_key, bit_length):
     
     # Instead of actually factoring, we'll simulate the time it would take
     # based on a simple model: checking all numbers up to sqrt(n)
+    # (trial division itself only tries the primes, see rsa_toolkit.sieve)
     
     if bit_length <= 256:  # Actually perform factorization for small bit lengths
         factor_found = False
         
-        for i in range(2, int(math.sqrt(n)) + 1):
-            if n % i == 0:
+        if strategy != "trial_division":
+            result = factorization.factorize(n, strategy, metrics=metrics)
+            for name, seconds in result["timings"].items():
+                print(f"    -> {name}: {seconds:.6f} seconds")
+            if result["factors"] is not None:
                 factor_found = True
-                p = i
-                q = n // i
-                break
+                p, q = result["factors"]
+            elif "estimate" in result:
+                # Too big to finish within the rho budget: report the expected cost instead
+                estimate = result["estimate"]
+                print(f"    -> {estimate['strategy']} skipped: about 2^{estimate['iterations'].bit_length()} "
+                      f"iterations expected")
+                return "Simulation", estimate["seconds"], None
+        elif workers > 1:
+            divisor, worker_stats = parallel.parallel_search("factor", (n,), 2, int(math.sqrt(n)) + 1,
+                                                             workers=workers)
+            parallel.print_worker_stats(worker_stats)
+            if metrics is not None:
+                tested = sum(stats["candidates"] for stats in worker_stats.values())
+                metrics.tested(tested, division=tested)
+            if divisor is not None:
+                factor_found = True
+                p = divisor
+                q = n // divisor
+        else:
+            divisor = factorization.trial_division(n, int(math.sqrt(n)), metrics=metrics)
+            if divisor is not None:
+                factor_found = True
+                p = divisor
+                q = n // divisor
         
         end_time = time.time()
         duration = end_time - start_time
@@ -146,8 +205,13 @@ def simulate_brute_force(public_key, bit_length):
         # We're not actually performing the attack, so return a placeholder
         return "Simulation", estimated_time, None
 
-def demonstrate_rsa_with_bit_length(bit_length, message):
-    """Demonstrate RSA encryption and decryption with specified bit length."""
+def demonstrate_rsa_with_bit_length(bit_length, message, workers=1, strategy="trial_division", metrics=None):
+    """
+    Demonstrate RSA encryption and decryption with specified bit length.
+
+    Pass a metrics.Metrics object to count the work done by key generation
+    and the attack; its report is printed at the end.
+    """
     print(f"\n{'='*80}")
     print(f"RSA WITH {bit_length}-BIT PRIMES")
     print(f"{'='*80}")
@@ -155,7 +219,7 @@ def demonstrate_rsa_with_bit_length(bit_length, message):
     try:
         # Generate keys
         print("Generating RSA keys...")
-        public_key, private_key, p, q = generate_rsa_keys(bit_length)
+        public_key, private_key, p, q = generate_rsa_keys(bit_length, metrics=metrics)
         e, n = public_key
         d, _ = private_key
         
@@ -175,9 +239,28 @@ def demonstrate_rsa_with_bit_length(bit_length, message):
             decrypted = rsa_decrypt(encrypted, private_key)
             print(f"Decrypted: '{decrypted}'")
             
+            # Block mode: one exponentiation per block instead of per character, shown
+            # only when that is fewer (the length header costs extra blocks for small n)
+            if n.bit_length() > 8 and blocks.block_count(len(message.encode('utf-8')), n) < len(message):
+                block_ciphertext = rsa_encrypt_blocks(message, public_key)
+                print(f"Block mode: {len(block_ciphertext) // blocks.ciphertext_block_size(n)} block(s) "
+                      f"of {blocks.plaintext_block_size(n)} bytes (vs {len(message)} per-character encryptions)")
+                print(f"Block mode decrypted: '{rsa_decrypt_blocks(block_ciphertext, private_key).decode('utf-8')}'")
+            
+            # Codebook attack: every character is one of at most 256 plaintexts
+            print("\nRunning codebook attack...")
+            start_time = time.time()
+            recovered = codebook.get_codebook(public_key, "bytes").decrypt_text(encrypted)
+            print(f"Codebook attack recovered: '{recovered}' in {time.time() - start_time:.6f} seconds")
+            
+            # Brute force every character at once instead of one full scan per character
+            recovered, elapsed = rsa_brute_force(encrypted, public_key)
+            print(f"Multi-target brute force recovered: '{recovered}' in {elapsed:.6f} seconds")
+            
             # Simulate brute force attack
-            print("\nSimulating brute force attack...")
-            result, duration, factors = simulate_brute_force(public_key, bit_length)
+            print(f"\nSimulating brute force attack ({strategy})...")
+            result, duration, factors = simulate_brute_force(public_key, bit_length, workers=workers,
+                                                         strategy=strategy, metrics=metrics)
             
             if result is True:
                 print(f"Attack successful! Factors found: p={factors[0]}, q={factors[1]}")
@@ -188,6 +271,9 @@ def demonstrate_rsa_with_bit_length(bit_length, message):
                 print("Note: Actual time would vary based on hardware and optimization.")
             else:
                 print(f"Attack unsuccessful after {duration:.6f} seconds")
+            
+            if metrics is not None:
+                print_report(metrics)
         
         except ValueError as e:
             print(f"Error: {e}")
@@ -201,7 +287,7 @@ def main():
     bit_lengths = [2, 4, 8, 16, 32, 64, 128, 256]
     
     for bit_length in bit_lengths:
-        demonstrate_rsa_with_bit_length(bit_length, message)
+        demonstrate_rsa_with_bit_length(bit_length, message, strategy="auto")
 
 if __name__ == "__main__":
     main()
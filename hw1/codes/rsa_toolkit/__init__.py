@@ -0,0 +1,12 @@
+"""
+Reusable RSA attack and key-generation helpers for the CENG418 HW1 scripts.
+
+The top-level scripts (ceng418_hw1_v1.py, ceng418_yusuf_v1.py) import the
+engines from here so that they can be shared between experiments. The RSA
+primitives are re-exported below; `python -m rsa_toolkit` runs the sweep.
+Importing the package stays cheap: NumPy, matplotlib and tabulate are only
+loaded by the code paths that use them.
+"""
+from rsa_toolkit.core import (brute_force_decrypt, brute_force_decrypt_many, budgeted_brute_force,
+                              decrypt_message, encrypt_message, gcd, generate_prime,
+                              generate_rsa_keys, mod_inverse, test_rsa_with_bit_length)
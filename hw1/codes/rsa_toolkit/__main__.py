@@ -0,0 +1,4 @@
+from rsa_toolkit.sweep import main
+
+if __name__ == "__main__":
+    main()
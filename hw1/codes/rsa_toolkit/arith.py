@@ -0,0 +1,131 @@
+"""
+Pluggable big-integer backend for the modexp-heavy paths.
+
+Call sites use powmod(), invert(), convert() and modulus_context() from here
+instead of the built-in int/pow, and the active backend decides how the
+arithmetic is done:
+
+- "python": built-in int and the three-argument pow (always available)
+- "gmpy2": GMP integers through gmpy2, if it is installed
+
+The default is "gmpy2" when the package is found at import time, otherwise
+"python"; set_backend() or the RSA_TOOLKIT_BACKEND environment variable
+overrides it. Only the presence of gmpy2 is checked at import time, the
+module itself is imported on first use.
+
+Neither backend exposes its Montgomery state, so a ModulusContext reuses what
+can be reused for a fixed n: the modulus converted once to the backend type
+and a bound exponentiation function, so a loop over many bases pays no
+per-call conversion or dispatch.
+"""
+import functools
+import importlib.util
+import os
+
+GMPY2_AVAILABLE = importlib.util.find_spec("gmpy2") is not None
+
+
+class PythonBackend:
+    """Built-in int arithmetic."""
+
+    name = "python"
+
+    def convert(self, x):
+        return int(x)
+
+    def powmod(self, base, exponent, modulus):
+        return pow(base, exponent, modulus)
+
+    def invert(self, a, modulus):
+        return pow(a, -1, modulus)
+
+    def bound_powmod(self, modulus):
+        """pow(base, exponent) modulo a fixed modulus."""
+        return functools.partial(pow, mod=modulus)
+
+
+class Gmpy2Backend:
+    """GMP arithmetic through gmpy2; results are converted back to int."""
+
+    name = "gmpy2"
+
+    def __init__(self):
+        import gmpy2
+        self.gmpy2 = gmpy2
+
+    def convert(self, x):
+        return self.gmpy2.mpz(x)
+
+    def powmod(self, base, exponent, modulus):
+        return int(self.gmpy2.powmod(base, exponent, modulus))
+
+    def invert(self, a, modulus):
+        return int(self.gmpy2.invert(a, modulus))
+
+    def bound_powmod(self, modulus):
+        """pow(base, exponent) modulo a fixed modulus."""
+        powmod = self.gmpy2.powmod
+        modulus = self.gmpy2.mpz(modulus)
+        return lambda base, exponent: int(powmod(base, exponent, modulus))
+
+
+BACKENDS = {
+    "python": PythonBackend,
+    "gmpy2": Gmpy2Backend,
+}
+
+DEFAULT_BACKEND = "gmpy2" if GMPY2_AVAILABLE else "python"
+
+_backend = None
+
+
+def set_backend(name):
+    """Switch the active backend ("python" or "gmpy2"); returns it."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown arithmetic backend: {name}")
+    if name == "gmpy2" and not GMPY2_AVAILABLE:
+        raise ValueError("The gmpy2 backend needs the gmpy2 package (pip install gmpy2)")
+    _backend = BACKENDS[name]()
+    return _backend
+
+
+def get_backend():
+    """The active backend, created on first use."""
+    if _backend is None:
+        return set_backend(os.environ.get("RSA_TOOLKIT_BACKEND", DEFAULT_BACKEND))
+    return _backend
+
+
+def convert(x):
+    """x as the active backend's integer type (for repeated % or // by small ints)."""
+    return get_backend().convert(x)
+
+
+def powmod(base, exponent, modulus):
+    """base^exponent mod modulus as an int."""
+    return get_backend().powmod(base, exponent, modulus)
+
+
+def invert(a, modulus):
+    """a^-1 mod modulus as an int."""
+    return get_backend().invert(a, modulus)
+
+
+class ModulusContext:
+    """Exponentiation modulo one fixed n, set up once for many bases."""
+
+    def __init__(self, n, backend=None):
+        self.n = n
+        self.backend = backend or get_backend()
+        self.pow = self.backend.bound_powmod(n)
+
+    def pow_many(self, bases, exponent):
+        """[b^exponent mod n for b in bases]."""
+        pow_ = self.pow
+        return [pow_(b, exponent) for b in bases]
+
+
+def modulus_context(n):
+    """A ModulusContext for n on the active backend."""
+    return ModulusContext(n)
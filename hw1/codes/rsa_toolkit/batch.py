@@ -0,0 +1,172 @@
+"""
+Vectorized (NumPy) brute-force engine for RSA moduli that fit in 64 bits.
+
+Instead of calling pow(m, e, n) once per candidate, whole blocks of candidates
+are exponentiated at once with square-and-multiply over uint64 arrays and the
+match is located with a single vectorized comparison. Moduli above 32 bits
+use Montgomery multiplication on 32-bit limbs, so every product stays exact
+in uint64 arithmetic; at 63-64 bits this still runs about 4x faster than the
+built-in pow() in a loop, but not faster than gmpy2 (see beats_loop()).
+"""
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 1 << 16
+# First block size; blocks double up to block_size so early matches stay cheap
+INITIAL_BLOCK_SIZE = 1 << 8
+MAX_MODULUS_BITS = 64
+DIRECT_MODULUS_BITS = 32
+
+
+def supports_modulus(n):
+    """
+    Return True if the modulus n can be handled by the uint64 engine.
+
+    Moduli of up to 32 bits are multiplied directly; larger ones, up to 64
+    bits, use Montgomery multiplication, which needs an odd modulus (every
+    RSA modulus is odd).
+    """
+    if n <= 1 or n.bit_length() > MAX_MODULUS_BITS:
+        return False
+    return n.bit_length() <= DIRECT_MODULUS_BITS or n % 2 == 1
+
+
+def beats_loop(n):
+    """
+    Return True if this engine outscans the scalar loop of the active arith backend on n.
+
+    Up to 32 bits it always does. Above, Montgomery in NumPy is 3-4x faster
+    than the built-in pow but 3-4x slower than gmpy2's powmod (measured at
+    33-64 bits), so it only wins against the pure-Python backend.
+    """
+    if not supports_modulus(n):
+        return False
+    from rsa_toolkit import arith
+    return n.bit_length() <= DIRECT_MODULUS_BITS or arith.get_backend().name == "python"
+
+
+_LOW = np.uint64(0xFFFFFFFF)
+_HALF = np.uint64(32)
+
+
+def _mul_wide(a, b):
+    """Full 128-bit product of uint64 arrays, as (high, low) 64-bit halves."""
+    a0, a1 = a & _LOW, a >> _HALF
+    b0, b1 = b & _LOW, b >> _HALF
+    p00, p01, p10 = a0 * b0, a0 * b1, a1 * b0
+    # Each 32x32-bit partial product fits in 64 bits; so does this column sum
+    middle = (p00 >> _HALF) + (p01 & _LOW) + (p10 & _LOW)
+    high = a1 * b1 + (p01 >> _HALF) + (p10 >> _HALF) + (middle >> _HALF)
+    return high, a * b
+
+
+class _Montgomery:
+    """Montgomery arithmetic modulo an odd n < 2^64, with R = 2^64."""
+
+    def __init__(self, n):
+        self.n = np.uint64(n)
+        # n * n_prime == -1 (mod 2^64)
+        self.n_prime = np.uint64(-pow(n, -1, 1 << 64) % (1 << 64))
+        self.r2 = np.uint64((1 << 128) % n)
+        self.one = np.uint64((1 << 64) % n)
+
+    def mul(self, a, b):
+        """a * b / R mod n for arrays already reduced mod n."""
+        high, low = _mul_wide(a, b)
+        # m * n cancels the low half of a * b, so (a * b + m * n) / R is exact
+        m = low * self.n_prime
+        mn_high, _ = _mul_wide(m, self.n)
+        # The low halves sum to 0 mod 2^64, carrying exactly when low != 0
+        carry_in = (low != 0).astype(np.uint64)
+        t = high + mn_high
+        wrapped = t < high
+        t += carry_in
+        wrapped |= (carry_in == 1) & (t == 0)
+        # t < 2n; past 2^64 the wrapped value minus n is still the right residue
+        return np.where(wrapped | (t >= self.n), t - self.n, t)
+
+    def to_montgomery(self, a):
+        return self.mul(a, np.full_like(a, self.r2))
+
+    def from_montgomery(self, a):
+        return self.mul(a, np.ones_like(a))
+
+
+def batch_modexp(bases, e, n):
+    """Compute bases ** e mod n element-wise for a uint64 array of bases."""
+    if not supports_modulus(n):
+        raise ValueError(f"Modulus n={n} is not supported by the uint64 engine")
+
+    n_arr = np.uint64(n)
+    bases = np.asarray(bases, dtype=np.uint64) % n_arr
+
+    if n.bit_length() <= DIRECT_MODULUS_BITS:
+        # Products of residues fit in 64 bits
+        result = np.ones_like(bases) % n_arr
+        for bit in bin(e)[2:]:
+            result = result * result % n_arr
+            if bit == '1':
+                result = result * bases % n_arr
+        return result
+
+    mont = _Montgomery(n)
+    bases = mont.to_montgomery(bases)
+    result = np.full_like(bases, mont.one)
+    # Left-to-right square-and-multiply; e is shared by every element
+    for bit in bin(e)[2:]:
+        result = mont.mul(result, result)
+        if bit == '1':
+            result = mont.mul(result, bases)
+    return mont.from_montgomery(result)
+
+
+def batch_search(ciphertext, e, n, start=0, stop=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Search m in [start, stop) with m^e mod n == ciphertext, one block at a time.
+
+    Returns the first matching m, or None if the range holds no match.
+    """
+    if stop is None:
+        stop = n
+    target = np.uint64(ciphertext % n)
+
+    block_start = start
+    size = min(INITIAL_BLOCK_SIZE, block_size)
+    while block_start < stop:
+        block_stop = min(block_start + size, stop)
+        candidates = np.arange(block_stop - block_start, dtype=np.uint64) + np.uint64(block_start)
+        hits = np.flatnonzero(batch_modexp(candidates, e, n) == target)
+        if hits.size:
+            return block_start + int(hits[0])
+        block_start = block_stop
+        size = min(2 * size, block_size)
+    return None
+
+
+def batch_search_many(ciphertexts, e, n, start=0, stop=None, block_size=DEFAULT_BLOCK_SIZE):
+    """
+    Search [start, stop) for the plaintexts of several ciphertexts in one sweep.
+
+    Every candidate block is exponentiated once and matched against all the
+    remaining targets; the sweep stops as soon as each target has been found.
+    Returns {ciphertext: m} for the targets found (the smallest m for each).
+    """
+    if stop is None:
+        stop = n
+    remaining = {c % n for c in ciphertexts}
+    found = {}
+
+    block_start = start
+    size = min(INITIAL_BLOCK_SIZE, block_size)
+    while remaining and block_start < stop:
+        block_stop = min(block_start + size, stop)
+        candidates = np.arange(block_stop - block_start, dtype=np.uint64) + np.uint64(block_start)
+        values = batch_modexp(candidates, e, n)
+        targets = np.fromiter(remaining, dtype=np.uint64, count=len(remaining))
+        for index in np.flatnonzero(np.isin(values, targets)):
+            c = int(values[index])
+            if c in remaining:
+                found[c] = block_start + int(index)
+                remaining.discard(c)
+        block_start = block_stop
+        size = min(2 * size, block_size)
+    return found
@@ -0,0 +1,112 @@
+"""
+Reproducible benchmark runner for the RSA brute-force sweep.
+
+Each bit length is one configuration: the random module is seeded from
+(seed, bits) before the setup step, the attack is run `warmup` times
+untimed and then `repeats` times under perf_counter_ns, and the median,
+interquartile range and minimum are stored in a JSON results file. The
+plotting and extrapolation code reads that file instead of in-memory lists.
+With a store_path, every configuration is also appended to a JSONL store
+(see rsa_toolkit.store) as soon as it has been measured.
+"""
+import json
+import platform
+import random
+import statistics
+import time
+from datetime import datetime
+
+from rsa_toolkit import store
+
+
+def config_seed(seed, bits):
+    """Seed used for one configuration, so every bit length is reproducible on its own."""
+    return seed * 1_000_003 + bits
+
+
+def summarize(times_ns):
+    """Median, IQR and min (in seconds) of a list of nanosecond timings."""
+    seconds = sorted(t / 1e9 for t in times_ns)
+    if len(seconds) >= 2:
+        q1, _, q3 = statistics.quantiles(seconds, n=4, method="inclusive")
+        iqr = q3 - q1
+    else:
+        iqr = 0.0
+    return {
+        "median_s": statistics.median(seconds),
+        "iqr_s": iqr,
+        "min_s": seconds[0],
+    }
+
+
+def run_benchmark(bit_lengths, setup, attack, repeats=5, warmup=1, seed=418, output_path=None,
+                  store_path=None, reset=None):
+    """
+    Benchmark `attack` for every bit length.
+
+    setup(bits) returns the arguments passed to attack(*args); it runs once
+    per bit length after seeding, so every repeat attacks the same key.
+    attack returns the recovered value (or a JSON-serializable progress
+    dict), which is recorded as the "outcome" of the configuration.
+    reset(), if given, runs untimed before every attack call: use it to drop
+    caches that would turn every repeat after the first into a lookup.
+    Returns the results dict, also written as JSON to output_path if given.
+    """
+    run = store.new_run(repeats=repeats, warmup=warmup, seed=seed,
+                        python=platform.python_version(), machine=platform.machine())
+    results = []
+    for bits in bit_lengths:
+        random.seed(config_seed(seed, bits))
+        args = setup(bits)
+
+        for _ in range(warmup):
+            if reset is not None:
+                reset()
+            attack(*args)
+
+        times_ns = []
+        outcome = None
+        for _ in range(repeats):
+            if reset is not None:
+                reset()
+            start = time.perf_counter_ns()
+            outcome = attack(*args)
+            times_ns.append(time.perf_counter_ns() - start)
+
+        entry = {"bits": bits, "times_ns": times_ns, "outcome": outcome}
+        entry.update(summarize(times_ns))
+        results.append(entry)
+        if store_path is not None:
+            store.append_record(store_path, dict(entry, run=run))
+        print(f"[✓] {bits}-bit: median {entry['median_s']:.6f}s, "
+              f"IQR {entry['iqr_s']:.6f}s, min {entry['min_s']:.6f}s over {repeats} runs")
+
+    data = {
+        "config": {
+            "bit_lengths": list(bit_lengths),
+            "repeats": repeats,
+            "warmup": warmup,
+            "seed": seed,
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "timestamp": datetime.now().isoformat(),
+            "run_id": run["id"],
+            "host": run["host"],
+        },
+        "results": results,
+    }
+    if output_path is not None:
+        with open(output_path, "w") as f:
+            json.dump(data, f, indent=2)
+        print(f"[✓] Benchmark results saved as '{output_path}'")
+    return data
+
+
+def load_results(path):
+    """Load a results file; returns (bit_lengths, median times in seconds, results dict)."""
+    with open(path) as f:
+        data = json.load(f)
+    bit_lengths = [entry["bits"] for entry in data["results"]]
+    times = [entry["median_s"] for entry in data["results"]]
+    return bit_lengths, times, data
@@ -0,0 +1,100 @@
+"""
+Block-packed (textbook) RSA encryption of byte strings.
+
+Instead of one exponentiation per character, as many bytes as always fit
+below n are packed into each integer: k = (bits(n) - 1) // 8 bytes per block,
+so a 256-bit modulus carries 31 bytes per exponentiation. The plaintext is
+framed with its length (8 bytes, big-endian) and zero-padded to a multiple
+of k; every ciphertext block is written with the fixed width of n.
+
+This is deterministic textbook RSA, meant for the course experiments rather
+than for protecting real data.
+"""
+from rsa_toolkit import arith
+from rsa_toolkit.keys import private_decrypt
+
+LENGTH_BYTES = 8
+
+
+def plaintext_block_size(n):
+    """Bytes of plaintext packed into one block, so that every block is < n."""
+    k = (n.bit_length() - 1) // 8
+    if k < 1:
+        raise ValueError(f"Modulus n={n} is too small for block mode (needs at least 9 bits)")
+    return k
+
+
+def ciphertext_block_size(n):
+    """Bytes needed to store one ciphertext block (any value below n)."""
+    return (n.bit_length() + 7) // 8
+
+
+def block_count(length, n):
+    """Number of blocks encrypt_bytes produces for `length` bytes under modulus n."""
+    k = plaintext_block_size(n)
+    return -(-(LENGTH_BYTES + length) // k)
+
+
+def frame(data, k):
+    """Prefix data with its length and zero-pad the result to a multiple of k."""
+    framed = bytearray(len(data).to_bytes(LENGTH_BYTES, "big"))
+    framed += data
+    framed += bytes(-len(framed) % k)
+    return framed
+
+
+def encrypt_block(chunk, e, n, out_size, modexp=None):
+    """
+    Encrypt one plaintext block (bytes-like) into `out_size` bytes.
+
+    modexp is arith.modulus_context(n).pow; pass it in when encrypting many blocks.
+    """
+    if modexp is None:
+        modexp = arith.modulus_context(n).pow
+    m = int.from_bytes(chunk, "big")
+    return modexp(m, e).to_bytes(out_size, "big")
+
+
+def decrypt_block(chunk, private_key, k):
+    """Decrypt one ciphertext block (bytes-like) back into k plaintext bytes."""
+    _, n = private_key
+    c = int.from_bytes(chunk, "big")
+    if c >= n:
+        raise ValueError("Corrupted ciphertext: block is not below the modulus")
+    m = private_decrypt(c, private_key)
+    if m >> (8 * k):
+        raise ValueError(f"Corrupted ciphertext: block does not decrypt to {k} bytes")
+    return m.to_bytes(k, "big")
+
+
+def encrypt_bytes(data, public_key):
+    """Encrypt bytes / bytearray / memoryview data; returns the ciphertext as bytes."""
+    e, n = public_key
+    k = plaintext_block_size(n)
+    out_size = ciphertext_block_size(n)
+    view = memoryview(frame(data, k))
+    modexp = arith.modulus_context(n).pow
+
+    out = bytearray()
+    for offset in range(0, len(view), k):
+        out += encrypt_block(view[offset:offset + k], e, n, out_size, modexp)
+    return bytes(out)
+
+
+def decrypt_bytes(data, private_key):
+    """Decrypt the output of encrypt_bytes (bytes-like); returns the plaintext bytes."""
+    _, n = private_key
+    k = plaintext_block_size(n)
+    in_size = ciphertext_block_size(n)
+    view = memoryview(data)
+    if len(view) % in_size:
+        raise ValueError(f"Ciphertext length {len(view)} is not a multiple of the block size {in_size}")
+
+    out = bytearray()
+    for offset in range(0, len(view), in_size):
+        out += decrypt_block(view[offset:offset + in_size], private_key, k)
+
+    length = int.from_bytes(out[:LENGTH_BYTES], "big")
+    if length > len(out) - LENGTH_BYTES:
+        raise ValueError("Corrupted ciphertext: length header exceeds the decrypted data")
+    return bytes(out[LENGTH_BYTES:LENGTH_BYTES + length])
@@ -0,0 +1,127 @@
+"""
+Time- or candidate-budgeted brute-force search with checkpoint/resume.
+
+The candidate range is scanned in steps; between steps the budget is checked
+and, every `checkpoint_interval` seconds, the position is written to a JSON
+checkpoint. Starting again with the same checkpoint file resumes where the
+previous run stopped. Every run returns its partial progress: the candidates
+covered so far, the measured rate and the fraction of [0, n) covered.
+"""
+import json
+import os
+import time
+
+from rsa_toolkit import arith, batch
+
+STEP_SIZES = {
+    "python": 1 << 14,
+    "numpy": batch.DEFAULT_BLOCK_SIZE * 4,
+}
+
+
+def _scan_python(ciphertext, e, n, start, stop):
+    modexp = arith.modulus_context(n).pow
+    for m in range(start, stop):
+        if modexp(m, e) == ciphertext:
+            return m
+    return None
+
+
+def _scan_numpy(ciphertext, e, n, start, stop):
+    return batch.batch_search(ciphertext, e, n, start, stop)
+
+
+SCANNERS = {
+    "python": _scan_python,
+    "numpy": _scan_numpy,
+}
+
+
+def load_checkpoint(path, ciphertext, public_key):
+    """Return the saved search state for this ciphertext/key, or None."""
+    try:
+        with open(path) as f:
+            state = json.load(f)
+    except FileNotFoundError:
+        return None
+    e, n = public_key
+    if (state["e"], state["n"], state["ciphertext"]) != (e, n, ciphertext):
+        raise ValueError(f"Checkpoint '{path}' belongs to a different ciphertext or key")
+    return state
+
+
+def save_checkpoint(path, state):
+    """Atomically write the search state to path."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
+
+
+def budgeted_search(ciphertext, public_key, max_seconds=None, max_candidates=None,
+                    checkpoint_path=None, checkpoint_interval=10.0, engine="python"):
+    """
+    Search m with m^e mod n == ciphertext until found, exhausted or out of budget.
+
+    max_seconds / max_candidates bound this run (not the resumed total).
+    Returns a progress dict: found, next_candidate, tested and elapsed
+    (totals across resumed runs), rate (candidates/s in this run),
+    coverage (fraction of [0, n) scanned) and complete.
+    """
+    if engine == "numpy" and not batch.supports_modulus(public_key[1]):
+        engine = "python"
+    scan = SCANNERS[engine]
+    step = STEP_SIZES[engine]
+    e, n = public_key
+
+    state = None
+    if checkpoint_path is not None:
+        state = load_checkpoint(checkpoint_path, ciphertext, public_key)
+    if state is None:
+        state = {"e": e, "n": n, "ciphertext": ciphertext,
+                 "next_candidate": 0, "tested": 0, "elapsed": 0.0, "found": None}
+
+    run_start = time.perf_counter()
+    last_checkpoint = run_start
+    run_tested = 0
+    position = state["next_candidate"]
+
+    while state["found"] is None and position < n:
+        now = time.perf_counter()
+        if max_seconds is not None and now - run_start >= max_seconds:
+            break
+        if max_candidates is not None and run_tested >= max_candidates:
+            break
+
+        stop = min(position + step, n)
+        if max_candidates is not None:
+            stop = min(stop, position + max_candidates - run_tested)
+        found = scan(ciphertext, e, n, position, stop)
+        if found is not None:
+            state["found"] = found
+            stop = found + 1
+        run_tested += stop - position
+        position = stop
+
+        if checkpoint_path is not None and time.perf_counter() - last_checkpoint >= checkpoint_interval:
+            state["next_candidate"] = position
+            save_checkpoint(checkpoint_path, dict(state, tested=state["tested"] + run_tested,
+                                                  elapsed=state["elapsed"] + time.perf_counter() - run_start))
+            last_checkpoint = time.perf_counter()
+
+    run_elapsed = time.perf_counter() - run_start
+    state["next_candidate"] = position
+    state["tested"] += run_tested
+    state["elapsed"] += run_elapsed
+    if checkpoint_path is not None:
+        save_checkpoint(checkpoint_path, state)
+
+    return {
+        "found": state["found"],
+        "next_candidate": position,
+        "tested": state["tested"],
+        "elapsed": state["elapsed"],
+        "rate": run_tested / run_elapsed if run_elapsed > 0 else 0.0,
+        "coverage": position / n,
+        "complete": state["found"] is not None or position >= n,
+    }
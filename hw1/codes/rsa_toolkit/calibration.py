@@ -0,0 +1,183 @@
+"""
+Host calibration and complexity models for cracking-time estimates.
+
+Instead of assuming a fixed FLOPS figure, the current host is measured:
+modular exponentiations per second and trial divisions per second at each
+operand size, repeated to get a mean and a 95% confidence interval. The
+models then count the operations each attack needs and divide by the
+measured rates:
+
+- exhaustive search: n / 2 modexps on average (O(n))
+- trial division: pi(sqrt n) ~ sqrt(n) / ln(sqrt n) divisions by primes (O(sqrt n))
+- GNFS: L_n[1/3, (64/9)^(1/3)], anchored to the RSA-768 factorization
+
+All counts and times are kept as log10 values, since they overflow floats
+for realistic key sizes.
+"""
+import json
+import math
+import random
+import statistics
+import time
+
+# Two-sided 95% Student t quantiles by degrees of freedom
+T_95 = {1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+        8: 2.306, 9: 2.262, 10: 2.228, 15: 2.131, 20: 2.086, 30: 2.042}
+
+# RSA-768 took about 2000 single-core years (2.2 GHz Opteron), Kleinjung et al. 2010
+GNFS_ANCHOR_BITS = 768
+GNFS_ANCHOR_SECONDS = 2000 * 365.25 * 86400
+# The anchor is only known to within a factor of about 2 either way
+GNFS_ANCHOR_UNCERTAINTY = 2.0
+
+SECONDS_PER_YEAR = 365.25 * 86400
+
+
+def t_quantile(df):
+    """95% two-sided t quantile, rounding df down to the nearest tabulated value."""
+    if df < 1:
+        return float("inf")
+    tabulated = [k for k in T_95 if k <= df]
+    return T_95[max(tabulated)] if df <= 30 else 1.96
+
+
+def confidence_interval(samples):
+    """(mean, low, high) of the samples with a 95% t-interval."""
+    mean = statistics.fmean(samples)
+    if len(samples) < 2:
+        return mean, mean, mean
+    half_width = t_quantile(len(samples) - 1) * statistics.stdev(samples) / math.sqrt(len(samples))
+    return mean, max(mean - half_width, 0.0), mean + half_width
+
+
+def _measure_rate(operation, count, repeats):
+    """Run operation(count) `repeats` times; returns a list of operations/s."""
+    rates = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        operation(count)
+        rates.append(count / (time.perf_counter() - start))
+    return rates
+
+
+def measure_modexp_rate(bits, count=200, repeats=7, rng=random):
+    """pow(m, e, n) per second for a `bits`-bit n and a full-size exponent e."""
+    n = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+    e = rng.getrandbits(bits) | 1
+    bases = [rng.randrange(2, n) for _ in range(count)]
+
+    def operation(count):
+        for m in bases[:count]:
+            pow(m, e, n)
+
+    return confidence_interval(_measure_rate(operation, count, repeats))
+
+
+def measure_division_rate(bits, count=200_000, repeats=7, rng=random):
+    """n % d per second for a `bits`-bit n and small odd divisors d."""
+    n = rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+
+    def operation(count):
+        for d in range(3, 3 + 2 * count, 2):
+            n % d
+
+    return confidence_interval(_measure_rate(operation, count, repeats))
+
+
+def calibrate(bit_sizes, repeats=7, output_path=None):
+    """
+    Measure modexp and trial-division rates at every operand size.
+
+    Returns {bits: {"modexp": (mean, low, high), "division": (...)}} and
+    writes it as JSON to output_path if given.
+    """
+    table = {}
+    for bits in bit_sizes:
+        # Bigger operands are slower: shrink the batches so each size takes similar time
+        modexp_count = max(10, 200 * 256 // bits)
+        table[bits] = {
+            "modexp": measure_modexp_rate(bits, count=modexp_count, repeats=repeats),
+            "division": measure_division_rate(bits, repeats=repeats),
+        }
+        print(f"[✓] Calibrated {bits}-bit operands: {table[bits]['modexp'][0]:,.0f} modexp/s, "
+              f"{table[bits]['division'][0]:,.0f} divisions/s")
+    if output_path is not None:
+        with open(output_path, "w") as f:
+            json.dump({str(bits): rates for bits, rates in table.items()}, f, indent=2)
+        print(f"[✓] Calibration saved as '{output_path}'")
+    return table
+
+
+def load_calibration(path):
+    """Load a calibration table written by calibrate()."""
+    with open(path) as f:
+        return {int(bits): {kind: tuple(rate) for kind, rate in rates.items()}
+                for bits, rates in json.load(f).items()}
+
+
+def log10_exhaustive_ops(bits):
+    """log10 of the expected modexps of an exhaustive search over [0, n): n / 2."""
+    # n is about 2^bits, so on average 2^(bits - 1) candidates are tried
+    return (bits - 1) * math.log10(2)
+
+
+def log10_trial_division_ops(bits):
+    """log10 of the prime divisors up to sqrt(n): pi(sqrt n) ~ sqrt(n) / ln(sqrt n)."""
+    half = bits / 2
+    return half * math.log10(2) - math.log10(half * math.log(2))
+
+
+def log_l_notation(bits):
+    """ln of L_n[1/3, (64/9)^(1/3)] for an n of the given size."""
+    ln_n = bits * math.log(2)
+    return (64 / 9) ** (1 / 3) * ln_n ** (1 / 3) * math.log(ln_n) ** (2 / 3)
+
+
+def log10_gnfs_seconds(bits):
+    """log10 of the single-core GNFS time, scaled from the RSA-768 record by L-notation."""
+    return (math.log10(GNFS_ANCHOR_SECONDS)
+            + (log_l_notation(bits) - log_l_notation(GNFS_ANCHOR_BITS)) / math.log(10))
+
+
+def _rates_for(table, bits, kind):
+    """Rates measured at the calibrated operand size closest to `bits`."""
+    closest = min(table, key=lambda size: abs(math.log2(size) - math.log2(bits)))
+    return table[closest][kind]
+
+
+def estimate(bits, table):
+    """
+    Single-core time estimates for breaking a `bits`-bit modulus.
+
+    Returns {algorithm: (log10 seconds, log10 low, log10 high)}; the interval
+    comes from the rate confidence interval (or the GNFS anchor uncertainty).
+    """
+    estimates = {}
+    for name, log10_ops, kind in [("exhaustive search", log10_exhaustive_ops(bits), "modexp"),
+                                  ("trial division", log10_trial_division_ops(bits), "division")]:
+        mean, low, high = _rates_for(table, bits, kind)
+        # A faster rate gives the lower time bound
+        estimates[name] = (log10_ops - math.log10(mean),
+                           log10_ops - math.log10(high),
+                           log10_ops - math.log10(low) if low > 0 else float("inf"))
+    gnfs = log10_gnfs_seconds(bits)
+    spread = math.log10(GNFS_ANCHOR_UNCERTAINTY)
+    estimates["GNFS"] = (gnfs, gnfs - spread, gnfs + spread)
+    return estimates
+
+
+def format_log10_seconds(log10_seconds):
+    """Human-readable duration for a log10(seconds) value of any size."""
+    if log10_seconds == float("inf"):
+        return "unbounded"
+    if log10_seconds < math.log10(SECONDS_PER_YEAR):
+        seconds = 10 ** log10_seconds
+        for unit, size in [("days", 86400), ("hours", 3600), ("minutes", 60)]:
+            if seconds >= size:
+                return f"{seconds / size:.2f} {unit}"
+        return f"{seconds:.2f} seconds" if seconds >= 0.01 else f"{seconds:.2e} seconds"
+    log10_years = log10_seconds - math.log10(SECONDS_PER_YEAR)
+    if log10_years < 3:
+        return f"{10 ** log10_years:.2f} years"
+    exponent = math.floor(log10_years)
+    return f"{10 ** (log10_years - exponent):.2f}e+{exponent} years"
@@ -0,0 +1,76 @@
+"""
+Codebook (dictionary) attack for RSA ciphertexts over a small plaintext domain.
+
+The course scripts encrypt one character at a time (m = ord(char)), so there
+are at most 256 possible plaintexts regardless of the size of n. Encrypting
+the whole domain once gives a table {pow(m, e, n): m}, after which every
+ciphertext is decrypted with a dictionary lookup instead of a scan over n.
+"""
+from rsa_toolkit import arith
+
+DOMAINS = {
+    "ascii": lambda: range(128),
+    "bytes": lambda: range(256),
+}
+
+# Built codebooks, keyed by (e, n, domain name)
+_cache = {}
+
+
+class Codebook:
+    """Lookup table from ciphertext to plaintext for one public key and domain."""
+
+    def __init__(self, public_key, plaintexts):
+        e, n = public_key
+        self.public_key = public_key
+        self.table = {}
+        modexp = arith.modulus_context(n).pow
+        for m in plaintexts:
+            # Keep the smallest m for colliding ciphertexts (m >= n wraps around)
+            self.table.setdefault(modexp(m, e), m)
+
+    def __len__(self):
+        return len(self.table)
+
+    def lookup(self, ciphertext):
+        """Return the plaintext for one ciphertext, or None if it is not in the domain."""
+        return self.table.get(ciphertext)
+
+    def decrypt(self, ciphertexts):
+        """Decrypt a list of ciphertexts; unknown ciphertexts map to None."""
+        table = self.table
+        return [table.get(c) for c in ciphertexts]
+
+    def decrypt_text(self, ciphertexts):
+        """Decrypt per-character ciphertexts back into a string."""
+        plaintexts = self.decrypt(ciphertexts)
+        if None in plaintexts:
+            missing = plaintexts.index(None)
+            raise ValueError(f"Ciphertext {ciphertexts[missing]} is not in the codebook domain")
+        return "".join(map(chr, plaintexts))
+
+
+def get_codebook(public_key, domain="ascii"):
+    """
+    Return the (cached) codebook of public_key over a plaintext domain.
+
+    domain is "ascii", "bytes" or a callable returning an iterable of
+    integer plaintexts. Callables are cached under the callable itself, so
+    pass the same function again to reuse the table.
+    """
+    e, n = public_key
+    key = (e, n, domain)
+    if key not in _cache:
+        if callable(domain):
+            plaintexts = domain()
+        elif domain in DOMAINS:
+            plaintexts = DOMAINS[domain]()
+        else:
+            raise ValueError(f"Unknown plaintext domain: {domain}")
+        _cache[key] = Codebook(public_key, plaintexts)
+    return _cache[key]
+
+
+def clear_cache():
+    """Drop every cached codebook."""
+    _cache.clear()
@@ -0,0 +1,263 @@
+"""
+RSA primitives of the HW1 experiments: prime and key generation, textbook
+encryption/decryption and the brute-force attack front-end.
+
+Importing this module is cheap. The NumPy batch engine, the process pool and
+the budgeted search are only imported when an engine actually needs them.
+"""
+import math
+import random
+import time
+
+from rsa_toolkit import arith, codebook, keys, primes
+from rsa_toolkit.metrics import CHUNK
+
+
+def generate_prime(bits, pool=None, metrics=None):
+    print(f"[+] Generating a {bits}-bit prime...")
+    p = primes.generate_prime(bits, pool=pool, metrics=metrics)
+    print(f"    -> Prime found: {p}")
+    return p
+
+def gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+def mod_inverse(a, m):
+    m0, x0, x1 = m, 0, 1
+    while a > 1:
+        q = a // m
+        m, a = a % m, m
+        x0, x1 = x1 - q * x0, x0
+    return x1 + m0 if x1 < 0 else x1
+
+def generate_rsa_keys(bits, metrics=None, pool=None):
+    """
+    Generate RSA key pair using primes of specified bit length.
+
+    With a primes.PrimePool, p and q are drawn from the pool instead of
+    being searched for.
+    """
+    print(f"[+] Generating RSA keys using {bits}-bit primes...")
+    # Generate two distinct primes
+    p = generate_prime(bits, pool=pool, metrics=metrics)
+    q = generate_prime(bits, pool=pool, metrics=metrics)
+    
+    # Ensure p and q are different
+    max_attempts = 20
+    attempts = 0
+    while p == q and attempts < max_attempts:
+        print(f"    -> Duplicated primes, regenerating q...")
+        q = generate_prime(bits, pool=pool, metrics=metrics)
+        attempts += 1
+    
+    if p == q:
+        raise ValueError(f"Could not generate distinct primes after {max_attempts} attempts")
+    
+    # Calculate n and totient
+    n = p * q
+    phi = (p - 1) * (q - 1)
+    
+    # Find e such that gcd(e, phi) = 1
+    # For very small bit lengths, phi might be too small
+    if phi <= 2:
+        # For extremely small totients, use a fixed approach
+        e = 1  # This is a special case for very small numbers
+        d = 1
+    else:
+        # Normal case
+        e = random.randint(2, phi - 1)
+        while math.gcd(e, phi) != 1:
+            e = random.randint(2, phi - 1)
+        
+        # Calculate d (modular multiplicative inverse)
+        d = pow(e, -1, phi)
+    
+    public_key = (e, n)
+    # Unpacks as (d, n) but also carries p, q, dp, dq, qinv for CRT decryption
+    private_key = keys.CRTPrivateKey(d, p, q)
+    
+    return public_key, private_key
+
+def encrypt_message(message, public_key):
+    """Encrypt a message using RSA public key."""
+    e, n = public_key
+    # Convert message to integer (ASCII value)
+    m = ord(message[0]) if isinstance(message, str) else message
+    
+    # Check if message is too large for the modulus
+    if m >= n:
+        print(f"    -> Warning: Message value {m} is >= modulus {n}")
+        print(f"    -> Message will be taken as {m % n} (modulo n)")
+        m = m % n
+    
+    # Encrypt: c = m^e mod n
+    c = arith.powmod(m, e, n)
+    print(f"[+] Encrypting message '{message}' to integer {m}")
+    print(f"    -> Ciphertext: {c}")
+    return c
+
+def decrypt_message(ciphertext, private_key):
+    """Decrypt a ciphertext with the RSA private key (CRT when available)."""
+    return keys.private_decrypt(ciphertext, private_key)
+
+def brute_force_decrypt(ciphertext, public_key, engine="python", block_size=None,
+                        workers=None, domain="ascii", metrics=None):
+    """
+    Attempt to find the message by trying all possible values.
+
+    engine="python" tests one candidate per loop iteration, engine="numpy"
+    tests whole blocks of candidates at once (only for moduli up to 64 bits, odd above 32),
+    engine="parallel" splits the range over `workers` processes and
+    engine="codebook" looks the ciphertext up in a table built over `domain`
+    and engine="auto" lets the attack planner run the cheapest applicable attack.
+    A Metrics object, if given, counts the candidates and modexps (sampled
+    per chunk by the Python loop, totalled at the end by the other engines).
+    """
+    e, n = public_key
+    if engine == "numpy":
+        from rsa_toolkit import batch
+    if engine == "numpy" and not batch.supports_modulus(n):
+        print("    -> Modulus not supported by the uint64 engine, falling back to the Python loop")
+        engine = "python"
+    print(f"[!] Starting brute-force decryption ({engine} engine)...")
+    
+    start_time = time.time()
+    original_value = None
+    
+    if engine == "numpy":
+        original_value = batch.batch_search(ciphertext, e, n, block_size=block_size or batch.DEFAULT_BLOCK_SIZE)
+        if metrics is not None:
+            tested = n if original_value is None else original_value + 1
+            metrics.tested(tested, modexp=tested)
+    elif engine == "parallel":
+        from rsa_toolkit import parallel
+        original_value, worker_stats = parallel.parallel_search("decrypt", (ciphertext, e, n), 0, n,
+                                                                workers=workers)
+        parallel.print_worker_stats(worker_stats)
+        if metrics is not None:
+            tested = sum(stats["candidates"] for stats in worker_stats.values())
+            metrics.tested(tested, modexp=tested)
+    elif engine == "codebook":
+        original_value = codebook.get_codebook(public_key, domain).lookup(ciphertext)
+        if metrics is not None:
+            metrics.add("codebook_lookup")
+    elif engine == "auto":
+        from rsa_toolkit import planner
+        result = planner.cheapest_attack(ciphertext, public_key, domain)
+        for step in result["plan"]:
+            print(f"    -> {step['attack']}: ~10^{step['log10_cost']:.1f} modmuls ({step['model']})")
+        print(f"    -> Picked: {result['attack']}")
+        original_value = result["plaintext"]
+    elif engine == "python":
+        modexp = arith.modulus_context(n).pow
+        if metrics is not None:
+            original_value = _instrumented_search(ciphertext, e, n, modexp, metrics)
+        else:
+            for m in range(n):  # Try all possible messages less than n
+                if modexp(m, e) == ciphertext:
+                    original_value = m
+                    break
+    else:
+        raise ValueError(f"Unknown brute-force engine: {engine}")
+    
+    elapsed = time.time() - start_time
+    return original_value, elapsed
+
+def _instrumented_search(ciphertext, e, n, modexp, metrics):
+    """The Python brute-force loop, reporting to metrics once per chunk of candidates."""
+    for chunk_start in range(0, n, CHUNK):
+        chunk_stop = min(chunk_start + CHUNK, n)
+        for m in range(chunk_start, chunk_stop):
+            if modexp(m, e) == ciphertext:
+                metrics.tested(m - chunk_start + 1, modexp=m - chunk_start + 1)
+                return m
+        metrics.tested(chunk_stop - chunk_start, modexp=chunk_stop - chunk_start)
+    return None
+
+def brute_force_decrypt_many(ciphertexts, public_key, engine="python", block_size=None):
+    """
+    Recover several ciphertexts under the same key with one candidate sweep.
+
+    Each pow(m, e, n) is computed once and checked against the set of targets
+    still missing, and the sweep stops as soon as all of them are found.
+    Returns ({ciphertext: m}, elapsed); targets without a match are left out.
+    """
+    e, n = public_key
+    if engine == "numpy":
+        from rsa_toolkit import batch
+    if engine == "numpy" and not batch.supports_modulus(n):
+        print("    -> Modulus not supported by the uint64 engine, falling back to the Python loop")
+        engine = "python"
+    remaining = set(ciphertexts)
+    print(f"[!] Starting multi-target brute-force decryption of {len(remaining)} ciphertexts ({engine} engine)...")
+    
+    start_time = time.time()
+    found = {}
+    
+    if engine == "numpy":
+        found = batch.batch_search_many(remaining, e, n, block_size=block_size or batch.DEFAULT_BLOCK_SIZE)
+    elif engine == "python":
+        modexp = arith.modulus_context(n).pow
+        for m in range(n):
+            if not remaining:
+                break
+            c = modexp(m, e)
+            if c in remaining:
+                found[c] = m
+                remaining.discard(c)
+    else:
+        raise ValueError(f"Unknown multi-target brute-force engine: {engine}")
+    
+    elapsed = time.time() - start_time
+    return found, elapsed
+
+def budgeted_brute_force(ciphertext, public_key, max_seconds=None, max_candidates=None,
+                         checkpoint_path=None, engine="numpy"):
+    """
+    Brute-force under a time and/or candidate budget, optionally resuming
+    from (and saving progress to) a checkpoint file. Returns the progress dict.
+    """
+    from rsa_toolkit import budget
+    print(f"[!] Starting budgeted brute-force decryption ({engine} engine)...")
+    progress = budget.budgeted_search(ciphertext, public_key, max_seconds=max_seconds,
+                                      max_candidates=max_candidates,
+                                      checkpoint_path=checkpoint_path, engine=engine)
+    status = "complete" if progress["complete"] else "stopped by budget"
+    print(f"    -> {status}: {progress['tested']:,} candidates in {progress['elapsed']:.4f}s "
+          f"({progress['rate']:,.0f} candidates/s, coverage {progress['coverage']:.2e} of n)")
+    return progress
+
+def test_rsa_with_bit_length(bits, message='A'):
+    """Test RSA with specified bit length and measure brute force time."""
+    print("\n" + "="*50)
+    print(f"[*] Testing {bits}-bit RSA key pair")
+    
+    # Generate key pair
+    public_key, private_key = generate_rsa_keys(bits)
+    e, n = public_key
+    d, n = private_key
+    
+    # Encrypt message
+    cipher = encrypt_message(message, public_key)
+    
+    # Decrypt with brute force
+    decrypted_value, elapsed = brute_force_decrypt(cipher, public_key)
+    
+    if decrypted_value is not None:
+        # Check if we need to map back to the original ASCII value
+        if decrypted_value < 128 and chr(decrypted_value) == message:
+            # Direct match with ASCII
+            print(f"[✓] Found message: {decrypted_value} ('{chr(decrypted_value)}') in {elapsed:.4f} seconds")
+        else:
+            # Recovered the encrypted value, but it's not the original ASCII
+            print(f"[✓] Found encrypted value: {decrypted_value} in {elapsed:.4f} seconds")
+            print(f"    -> Note: This is the correct encrypted value, but due to small modulus,")
+            print(f"       it's not the original ASCII value of '{message}' (which is {ord(message)})")
+    else:
+        print(f"[✗] Brute-force failed to find message in {elapsed:.4f} seconds")
+    
+    print(f"[✓] Brute-force completed in {elapsed:.4f} seconds for {bits}-bit keys")
+    
+    return elapsed
@@ -0,0 +1,130 @@
+"""
+Hybrid RSA-OAEP + AES-GCM envelopes for payloads of any size.
+
+Raw RSA-OAEP can only carry about 190 bytes under a 2048-bit key. An
+envelope encrypts the payload with a fresh AES-256-GCM key and wraps only
+that key with OAEP, so any payload costs one RSA operation.
+
+Layout:
+
+    MAGIC (8) | wrapped key length (2) | wrapped key | chunk size (4) | nonce prefix (7)
+    record 0 | record 1 | ... | final record
+
+The payload is cut into chunks of `chunk size` bytes, and each record is
+one chunk sealed with AES-GCM (ciphertext + 16-byte tag), so records have a
+fixed size except for the last one. The nonce of record i is
+prefix | i (4 bytes) | final flag (1 byte), and the header is the associated
+data of every record. Records therefore cannot be reordered, dropped or
+moved between envelopes, and a stream cut at a record boundary fails to
+open because its last record is not flagged final.
+"""
+import itertools
+import os
+import struct
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import padding
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from rsa_toolkit.streaming import DEFAULT_CHUNK_SIZE, iter_blocks, iter_file_chunks, write_chunks
+
+MAGIC = b"RSAENV01"
+KEY_BYTES = 32
+NONCE_PREFIX_BYTES = 7
+TAG_BYTES = 16
+ENVELOPE_CHUNK_SIZE = 1 << 16
+
+OAEP = padding.OAEP(mgf=padding.MGF1(algorithm=hashes.SHA256()), algorithm=hashes.SHA256(), label=None)
+
+
+def is_envelope(data):
+    """True if data (bytes-like) starts with an envelope header."""
+    return bytes(data[:len(MAGIC)]) == MAGIC
+
+
+def _nonce(prefix, index, final):
+    return prefix + struct.pack(">IB", index, final)
+
+
+def _with_last(iterable):
+    """Yield (item, is_last) pairs, looking one item ahead."""
+    iterator = iter(iterable)
+    try:
+        previous = next(iterator)
+    except StopIteration:
+        return
+    for item in iterator:
+        yield previous, False
+        previous = item
+    yield previous, True
+
+
+def seal_stream(chunks, public_key, chunk_size=ENVELOPE_CHUNK_SIZE):
+    """Yield the envelope of a stream of plaintext chunks for an RSA public key object."""
+    key = AESGCM.generate_key(bit_length=KEY_BYTES * 8)
+    wrapped = public_key.encrypt(key, OAEP)
+    prefix = os.urandom(NONCE_PREFIX_BYTES)
+    header = MAGIC + struct.pack(">H", len(wrapped)) + wrapped + struct.pack(">I", chunk_size) + prefix
+    yield header
+
+    aead = AESGCM(key)
+    index = 0
+    for block, last in _with_last(iter_blocks(chunks, chunk_size)):
+        yield aead.encrypt(_nonce(prefix, index, last), block, header)
+        index += 1
+    if index == 0:
+        # An empty payload still gets one (empty) final record
+        yield aead.encrypt(_nonce(prefix, 0, True), b"", header)
+
+
+def open_stream(chunks, private_key):
+    """Yield the plaintext chunks of an envelope stream for an RSA private key object."""
+    buffer = bytearray()
+    chunks = iter(chunks)
+    header_size = None
+    for chunk in chunks:
+        buffer += chunk
+        if len(buffer) >= len(MAGIC) + 2:
+            if bytes(buffer[:len(MAGIC)]) != MAGIC:
+                raise ValueError("Not an envelope: bad magic bytes")
+            wrapped_length = struct.unpack(">H", buffer[len(MAGIC):len(MAGIC) + 2])[0]
+            header_size = len(MAGIC) + 2 + wrapped_length + 4 + NONCE_PREFIX_BYTES
+            if len(buffer) >= header_size:
+                break
+    if header_size is None or len(buffer) < header_size:
+        raise ValueError("Truncated envelope: incomplete header")
+
+    header = bytes(buffer[:header_size])
+    wrapped = header[len(MAGIC) + 2:header_size - 4 - NONCE_PREFIX_BYTES]
+    chunk_size = struct.unpack(">I", header[-4 - NONCE_PREFIX_BYTES:-NONCE_PREFIX_BYTES])[0]
+    prefix = header[-NONCE_PREFIX_BYTES:]
+    aead = AESGCM(private_key.decrypt(wrapped, OAEP))
+
+    rest = [bytes(buffer[header_size:])]
+    records = iter_blocks(itertools.chain(rest, chunks), chunk_size + TAG_BYTES)
+    index = -1
+    for index, (record, last) in enumerate(_with_last(records)):
+        # A bad tag raises cryptography.exceptions.InvalidTag
+        yield aead.decrypt(_nonce(prefix, index, last), record, header)
+    if index < 0:
+        raise ValueError("Truncated envelope: no records")
+
+
+def seal(data, public_key, chunk_size=ENVELOPE_CHUNK_SIZE):
+    """Envelope of a bytes-like payload, as bytes."""
+    return b"".join(seal_stream([data], public_key, chunk_size))
+
+
+def open_envelope(data, private_key):
+    """Plaintext of an envelope produced by seal() or seal_file()."""
+    return b"".join(open_stream([data], private_key))
+
+
+def seal_file(src_path, dst_path, public_key, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Encrypt a file into an envelope, streaming it; returns the bytes written."""
+    return write_chunks(dst_path, seal_stream(iter_file_chunks(src_path, chunk_size), public_key))
+
+
+def open_file(src_path, dst_path, private_key, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Decrypt an envelope file, streaming it; returns the plaintext bytes written."""
+    return write_chunks(dst_path, open_stream(iter_file_chunks(src_path, chunk_size), private_key))
@@ -0,0 +1,237 @@
+"""
+Factorization strategies for RSA moduli.
+
+Every strategy has the signature strategy(n, **options) and returns a
+non-trivial factor of n, or None if it gave up. STRATEGIES maps the strategy
+names to the functions, and factorize() runs one of them (or the
+auto-selector) while timing every strategy it tried.
+"""
+import itertools
+import math
+import random
+import time
+
+from rsa_toolkit import arith
+from rsa_toolkit.metrics import CHUNK
+from rsa_toolkit.sieve import primes_up_to, wheel_candidates
+
+
+TRIAL_DIVISORS = {
+    "sieve": primes_up_to,
+    "wheel": wheel_candidates,
+    "naive": lambda limit: range(2, limit + 1),
+}
+
+
+def trial_division(n, limit=None, divisors="sieve", metrics=None):
+    """
+    Divide n by candidate divisors from 2 up to sqrt(n) (or `limit`).
+
+    divisors picks the candidates: "sieve" (primes only), "wheel" (numbers
+    coprime to 2, 3 and 5) or "naive" (every integer). A Metrics object, if
+    given, counts the divisions.
+    """
+    if limit is None:
+        limit = math.isqrt(n)
+    # With gmpy2, n % i on an mpz is much cheaper than on a large int
+    n = arith.convert(n)
+    candidates = TRIAL_DIVISORS[divisors](limit)
+    if metrics is not None:
+        return _instrumented_trial_division(n, iter(candidates), metrics)
+    for i in candidates:
+        if n % i == 0:
+            return i
+    return None
+
+
+def _instrumented_trial_division(n, candidates, metrics):
+    """trial_division's loop, reporting to metrics once per chunk of divisors."""
+    while chunk := list(itertools.islice(candidates, CHUNK)):
+        for tested, i in enumerate(chunk, 1):
+            if n % i == 0:
+                metrics.tested(tested, division=tested)
+                return i
+        metrics.tested(len(chunk), division=len(chunk))
+    return None
+
+
+def fermat(n, max_steps=1 << 20):
+    """
+    Fermat's method: find a with a^2 - n a perfect square b^2, so n = (a-b)(a+b).
+
+    Fast when the two prime factors are close to each other.
+    """
+    if n % 2 == 0:
+        return 2
+    a = math.isqrt(n)
+    if a * a < n:
+        a += 1
+    b2 = a * a - n
+    for _ in range(max_steps):
+        b = math.isqrt(b2)
+        if b * b == b2:
+            factor = a - b
+            return factor if 1 < factor < n else None
+        # (a + 1)^2 - a^2 = 2a + 1
+        b2 += 2 * a + 1
+        a += 1
+    return None
+
+
+def pollard_rho_brent(n, max_iterations=1 << 26, batch=128, retries=8, seed=None):
+    """
+    Pollard's rho with Brent's cycle finding and batched gcds.
+
+    Expected to need about sqrt(p) iterations for the smallest prime factor p.
+    """
+    if n % 2 == 0:
+        return 2
+    rng = random.Random(seed)
+
+    for _ in range(retries):
+        y = rng.randrange(1, n)
+        c = rng.randrange(1, n)
+        g = r = q = 1
+        iterations = 0
+
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                # Accumulate |x - y| products and take one gcd per batch
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+            r *= 2
+            iterations += r
+            if iterations > max_iterations:
+                return None
+
+        if g == n:
+            # The batch overshot: step back one iteration at a time
+            g = 1
+            while g == 1:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+        if g != n:
+            return g
+        # Degenerate cycle, retry with a different polynomial
+    return None
+
+
+def pollard_p_minus_1(n, bound=1 << 16, base=2):
+    """
+    Pollard's p-1: finds p when p - 1 is `bound`-smooth.
+
+    Raises base to the largest power of every prime <= bound modulo n.
+    """
+    if n % 2 == 0:
+        return 2
+    a = base
+    for i, p in enumerate(primes_up_to(bound), 1):
+        prime_power = p
+        while prime_power * p <= bound:
+            prime_power *= p
+        a = pow(a, prime_power, n)
+        # Checking the gcd every few steps keeps both factors from dropping out at once
+        if i % 128 == 0:
+            g = math.gcd(a - 1, n)
+            if g == n:
+                return None
+            if g > 1:
+                return g
+    g = math.gcd(a - 1, n)
+    return g if 1 < g < n else None
+
+
+STRATEGIES = {
+    "trial_division": trial_division,
+    "fermat": fermat,
+    "pollard_rho": pollard_rho_brent,
+    "pollard_p_minus_1": pollard_p_minus_1,
+}
+
+# Below this size trial division is cheaper than setting up anything clever
+TRIAL_DIVISION_BITS = 40
+# Iteration budget of Pollard rho when the auto-selector runs it
+RHO_MAX_ITERATIONS = 1 << 26
+
+
+def rho_expected_iterations(n):
+    """Expected Pollard rho iterations when n has two balanced factors: about sqrt(p) ~ n^(1/4)."""
+    return math.isqrt(math.isqrt(n))
+
+
+def rho_seconds_per_iteration(n, sample=1 << 12):
+    """Measure the cost of one rho iteration modulo n (one squaring and one product)."""
+    y = q = 2
+    start_time = time.perf_counter()
+    for _ in range(sample):
+        y = (y * y + 1) % n
+        q = q * (y + 1) % n
+    return (time.perf_counter() - start_time) / sample
+
+
+def select_strategies(n, rho_budget=RHO_MAX_ITERATIONS):
+    """
+    Return the strategy names the auto-selector tries for n, in order.
+
+    Pollard rho is left out when its expected iteration count exceeds
+    rho_budget, since it would run the whole budget and fail.
+    """
+    if n.bit_length() <= TRIAL_DIVISION_BITS:
+        return ["trial_division"]
+    # Cheap special-purpose methods first, then the general-purpose rho
+    strategies = ["fermat", "pollard_p_minus_1"]
+    if rho_expected_iterations(n) <= rho_budget:
+        strategies.append("pollard_rho")
+    return strategies
+
+
+# Short budgets for the special-purpose methods when the auto-selector runs them
+AUTO_OPTIONS = {
+    "fermat": {"max_steps": 1 << 12},
+    "pollard_p_minus_1": {"bound": 1 << 14},
+    "pollard_rho": {"max_iterations": RHO_MAX_ITERATIONS},
+}
+
+
+def factorize(n, strategy="auto", metrics=None, **options):
+    """
+    Split n into two factors with the chosen strategy (or "auto").
+
+    Returns a dict with "factors" ((p, q) or None), "strategy" (the strategy
+    that succeeded) and "timings" (seconds spent in every strategy tried).
+    When "auto" skipped Pollard rho as out of budget and nothing else
+    worked, "estimate" holds its expected "iterations" and "seconds".
+    The timings are also reported to `metrics` if a Metrics object is given.
+    """
+    if strategy == "auto":
+        plan = [(name, AUTO_OPTIONS.get(name, {})) for name in select_strategies(n)]
+    elif strategy in STRATEGIES:
+        plan = [(strategy, options)]
+    else:
+        raise ValueError(f"Unknown factorization strategy: {strategy}")
+
+    timings = {}
+    for name, strategy_options in plan:
+        start_time = time.perf_counter()
+        factor = STRATEGIES[name](n, **strategy_options)
+        timings[name] = time.perf_counter() - start_time
+        if metrics is not None:
+            metrics.timing(name, timings[name])
+        if factor is not None and 1 < factor < n:
+            p, q = sorted((factor, n // factor))
+            return {"factors": (p, q), "strategy": name, "timings": timings}
+
+    result = {"factors": None, "strategy": None, "timings": timings}
+    if strategy == "auto" and "pollard_rho" not in dict(plan) and n.bit_length() > TRIAL_DIVISION_BITS:
+        iterations = rho_expected_iterations(n)
+        result["estimate"] = {"strategy": "pollard_rho", "iterations": iterations,
+                              "seconds": iterations * rho_seconds_per_iteration(n)}
+    return result
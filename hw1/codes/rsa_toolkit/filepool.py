@@ -0,0 +1,128 @@
+"""
+Directories of pre-generated items, one file per item.
+
+An item is handed out by renaming its file away before reading it, so
+threads and processes sharing a pool directory never get the same item
+twice. Once fewer than `low_water` items remain, a background thread tops
+the directory up to `target_size`; every new item is written atomically and
+is usable as soon as it appears. Subclasses say how items are generated.
+"""
+import os
+import threading
+import uuid
+
+
+def write_atomic(path, data):
+    """Write bytes to path through a temporary file, so readers never see a partial file."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class FilePool:
+    """
+    Directory of pre-generated items (bytes), one `suffix` file each.
+
+    Subclasses implement _generate(count), which yields `count` new items.
+    """
+
+    suffix = ".item"
+
+    def __init__(self, directory, target_size=64, low_water=16):
+        self.directory = directory
+        self.target_size = target_size
+        self.low_water = low_water
+        self._refill = None
+        self._lock = threading.Lock()
+        # Directory listing cache: listing once per take would be quadratic for big batches
+        self._names = []
+        os.makedirs(directory, exist_ok=True)
+
+    def _generate(self, count):
+        raise NotImplementedError
+
+    def _files(self):
+        return [name for name in os.listdir(self.directory) if name.endswith(self.suffix)]
+
+    def available(self):
+        """Number of items currently in the pool."""
+        return len(self._files())
+
+    def _claim(self):
+        """Path of one pooled item, removed from the pool; None if it is empty."""
+        with self._lock:
+            while True:
+                if not self._names:
+                    self._names = self._files()
+                    if not self._names:
+                        return None
+                path = os.path.join(self.directory, self._names.pop())
+                claimed = path + ".claimed"
+                try:
+                    os.replace(path, claimed)
+                    return claimed
+                except FileNotFoundError:
+                    # Taken by another process sharing the pool directory
+                    continue
+
+    def take(self, generate=True):
+        """
+        Remove and return one item.
+
+        An empty pool generates the item on the spot, or returns None with
+        generate=False.
+        """
+        claimed = self._claim()
+        self._maybe_refill()
+        if claimed is None:
+            return next(iter(self._generate(1))) if generate else None
+        with open(claimed, "rb") as f:
+            data = f.read()
+        os.remove(claimed)
+        return data
+
+    def take_into(self, path, generate=True):
+        """
+        Move one pooled item to path; returns False if there was none.
+
+        An empty pool generates the item on the spot, unless generate=False.
+        """
+        claimed = self._claim()
+        self._maybe_refill()
+        if claimed is not None:
+            os.replace(claimed, path)
+            return True
+        if not generate:
+            return False
+        write_atomic(path, next(iter(self._generate(1))))
+        return True
+
+    def _maybe_refill(self):
+        if len(self._names) < self.low_water and self.available() < self.low_water:
+            self.refill(background=True)
+
+    def refill(self, background=False):
+        """Top the pool up to target_size, optionally on a daemon thread."""
+        if not background:
+            self._fill()
+            return None
+        with self._lock:
+            if self._refill is not None and self._refill.is_alive():
+                return self._refill
+            self._refill = threading.Thread(target=self._fill, daemon=True)
+            # Started under the lock, so a concurrent caller sees it alive and does not start a second fill
+            self._refill.start()
+            return self._refill
+
+    def _fill(self):
+        missing = self.target_size - self.available()
+        if missing <= 0:
+            return
+        for data in self._generate(missing):
+            write_atomic(os.path.join(self.directory, uuid.uuid4().hex + self.suffix), data)
+
+    def wait(self):
+        """Block until a running background refill has finished."""
+        if self._refill is not None:
+            self._refill.join()
@@ -0,0 +1,271 @@
+"""
+Storage backends for the Instructor's records in the anonymous submission protocol.
+
+A gradebook holds five mappings: registered_students (student ID -> key
+fingerprint), student_aid_map and aid_student_map (student ID <-> anonymous
+ID), submissions (anonymous ID -> {submission, grade, signature}) and
+published_grades (anonymous ID -> grade).
+
+MemoryGradebook keeps them in plain dicts, which is the default. SQLiteGradebook
+keeps them in an SQLite database in WAL mode, so the records survive a
+restart and a semester does not have to fit in memory. Its mappings read
+and write the tables directly. update() writes a whole batch in one
+transaction, and iteration walks the table in key order one page at a
+time. Grades change only through set_grade()/set_grades(), since a record
+returned by the SQLite mapping is a copy.
+"""
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+
+DEFAULT_PAGE_SIZE = 1000
+
+
+class MemoryGradebook:
+    """Instructor records in plain dicts (lost when the process exits)."""
+
+    def __init__(self):
+        # Maps student_id -> SHA-256 fingerprint of the public key PEM
+        self.registered_students = {}
+        # Maps student_id -> anonymous_id
+        self.student_aid_map = {}
+        # Maps anonymous_id -> student_id (reverse lookup)
+        self.aid_student_map = {}
+        # Maps anonymous_id -> {submission, grade, signature}
+        self.submissions = {}
+        # Maps anonymous_id -> grade (published)
+        self.published_grades = {}
+
+    def issue_anonymous_id(self, student_id, anonymous_id):
+        """Record a newly issued anonymous ID in both directions."""
+        self.student_aid_map[student_id] = anonymous_id
+        self.aid_student_map[anonymous_id] = student_id
+
+    def set_grade(self, anonymous_id, grade):
+        """Grade one submission; False if there is none with this anonymous ID."""
+        record = self.submissions.get(anonymous_id)
+        if record is None:
+            return False
+        record["grade"] = grade
+        return True
+
+    def set_grades(self, grades):
+        """Grade many (anonymous_id, grade) pairs; returns the number of submissions graded."""
+        return sum(self.set_grade(anonymous_id, grade) for anonymous_id, grade in grades)
+
+    def iter_submissions(self, ungraded=False, page_size=DEFAULT_PAGE_SIZE):
+        """Yield (anonymous_id, record) pairs, optionally only the ungraded ones."""
+        for anonymous_id, record in list(self.submissions.items()):
+            if not ungraded or record["grade"] is None:
+                yield anonymous_id, record
+
+    def publish(self):
+        """Publish the grade of every graded submission; returns the number of published grades."""
+        for anonymous_id, record in self.submissions.items():
+            if record["grade"] is not None:
+                self.published_grades[anonymous_id] = record["grade"]
+        return len(self.published_grades)
+
+    def iter_final_grades(self, page_size=DEFAULT_PAGE_SIZE):
+        """Yield (student_id, anonymous_id, grade) for the published grade of every student's current anonymous ID."""
+        for anonymous_id, grade in list(self.published_grades.items()):
+            student_id = self.aid_student_map.get(anonymous_id)
+            if student_id is not None and self.student_aid_map.get(student_id) == anonymous_id:
+                yield student_id, anonymous_id, grade
+
+    def close(self):
+        pass
+
+
+class _Table(MutableMapping):
+    """Dict-like view of one table, keyed by its primary key column."""
+
+    def __init__(self, gradebook, table, key, columns, encode, decode):
+        self._gradebook = gradebook
+        self._table = table
+        self._key = key
+        self._columns = columns
+        self._encode = encode
+        self._decode = decode
+        self._select = f"SELECT {', '.join(columns)} FROM {table} WHERE {key} = ?"
+        self._upsert = (f"INSERT OR REPLACE INTO {table} ({key}, {', '.join(columns)}) "
+                        f"VALUES ({', '.join('?' * (len(columns) + 1))})")
+
+    def __getitem__(self, key):
+        row = self._gradebook._query(self._select, (key,), one=True)
+        if row is None:
+            raise KeyError(key)
+        return self._decode(row)
+
+    def __contains__(self, key):
+        return self._gradebook._query(f"SELECT 1 FROM {self._table} WHERE {self._key} = ?", (key,), one=True) is not None
+
+    def __setitem__(self, key, value):
+        self.update({key: value})
+
+    def __delitem__(self, key):
+        with self._gradebook._transaction() as db:
+            if db.execute(f"DELETE FROM {self._table} WHERE {self._key} = ?", (key,)).rowcount == 0:
+                raise KeyError(key)
+
+    def __len__(self):
+        return self._gradebook._query(f"SELECT COUNT(*) FROM {self._table}", one=True)[0]
+
+    def __iter__(self):
+        for key, _ in self.items():
+            yield key
+
+    def items(self, page_size=None):
+        """Yield (key, value) pairs in key order, one page of rows per query."""
+        sql = (f"SELECT {self._key}, {', '.join(self._columns)} FROM {self._table} "
+               f"WHERE {self._key} > ? ORDER BY {self._key} LIMIT ?")
+        for row in self._gradebook._pages(sql, (), page_size):
+            yield row[0], self._decode(row[1:])
+
+    def values(self):
+        for _, value in self.items():
+            yield value
+
+    def update(self, other=(), **kwargs):
+        """Insert or replace many entries in a single transaction."""
+        pairs = other.items() if hasattr(other, "items") else other
+        rows = [(key,) + self._encode(value) for key, value in pairs]
+        rows += [(key,) + self._encode(value) for key, value in kwargs.items()]
+        with self._gradebook._transaction() as db:
+            db.executemany(self._upsert, rows)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS registered_students (student_id TEXT PRIMARY KEY, fingerprint TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS student_aid_map (student_id TEXT PRIMARY KEY, anonymous_id TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS student_aid_map_anonymous_id ON student_aid_map (anonymous_id);
+CREATE TABLE IF NOT EXISTS aid_student_map (anonymous_id TEXT PRIMARY KEY, student_id TEXT NOT NULL);
+CREATE INDEX IF NOT EXISTS aid_student_map_student_id ON aid_student_map (student_id);
+CREATE TABLE IF NOT EXISTS submissions (anonymous_id TEXT PRIMARY KEY, submission TEXT NOT NULL,
+                                        signature TEXT NOT NULL, grade);
+CREATE INDEX IF NOT EXISTS submissions_ungraded ON submissions (anonymous_id) WHERE grade IS NULL;
+CREATE TABLE IF NOT EXISTS published_grades (anonymous_id TEXT PRIMARY KEY, grade NOT NULL);
+"""
+
+
+def _single(row):
+    return row[0]
+
+
+def _as_row(value):
+    return (value,)
+
+
+def _encode_submission(record):
+    return json.dumps(record["submission"], sort_keys=True), record["signature"], record["grade"]
+
+
+def _decode_submission(row):
+    submission, signature, grade = row
+    return {"submission": json.loads(submission), "grade": grade, "signature": signature}
+
+
+class SQLiteGradebook:
+    """
+    Instructor records in an SQLite database (WAL mode), safe to share between threads.
+
+    page_size is the number of rows fetched per query when iterating.
+    """
+
+    def __init__(self, path, page_size=DEFAULT_PAGE_SIZE):
+        self.path = path
+        self.page_size = page_size
+        self._lock = threading.RLock()
+        # Autocommit mode: multi-statement writes open their own transactions
+        self._db = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        # WAL stays consistent with NORMAL; a power cut can only lose the last commits
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        # 64 MiB page cache: the primary key B-trees of a full semester stay mostly in memory
+        self._db.execute("PRAGMA cache_size=-65536")
+        self._db.executescript(SCHEMA)
+
+        self.registered_students = _Table(self, "registered_students", "student_id", ("fingerprint",),
+                                          _as_row, _single)
+        self.student_aid_map = _Table(self, "student_aid_map", "student_id", ("anonymous_id",), _as_row, _single)
+        self.aid_student_map = _Table(self, "aid_student_map", "anonymous_id", ("student_id",), _as_row, _single)
+        self.submissions = _Table(self, "submissions", "anonymous_id", ("submission", "signature", "grade"),
+                                  _encode_submission, _decode_submission)
+        self.published_grades = _Table(self, "published_grades", "anonymous_id", ("grade",), _as_row, _single)
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._db
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
+
+    def _query(self, sql, params=(), one=False):
+        with self._lock:
+            cursor = self._db.execute(sql, params)
+            return cursor.fetchone() if one else cursor.fetchall()
+
+    def _pages(self, sql, params, page_size):
+        """
+        Yield the rows of a keyset-paged query, one page at a time.
+
+        sql must select the key first and end with "> ? ORDER BY <key> LIMIT ?".
+        """
+        page_size = page_size or self.page_size
+        last = ""
+        while True:
+            rows = self._query(sql, params + (last, page_size))
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last = rows[-1][0]
+
+    def issue_anonymous_id(self, student_id, anonymous_id):
+        """Record a newly issued anonymous ID in both directions (one transaction)."""
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO student_aid_map VALUES (?, ?)", (student_id, anonymous_id))
+            db.execute("INSERT OR REPLACE INTO aid_student_map VALUES (?, ?)", (anonymous_id, student_id))
+
+    def set_grade(self, anonymous_id, grade):
+        """Grade one submission; False if there is none with this anonymous ID."""
+        return self.set_grades([(anonymous_id, grade)]) == 1
+
+    def set_grades(self, grades):
+        """Grade many (anonymous_id, grade) pairs in one transaction; returns the number graded."""
+        with self._transaction() as db:
+            before = db.total_changes
+            db.executemany("UPDATE submissions SET grade = ? WHERE anonymous_id = ?",
+                           [(grade, anonymous_id) for anonymous_id, grade in grades])
+            return db.total_changes - before
+
+    def iter_submissions(self, ungraded=False, page_size=None):
+        """Yield (anonymous_id, record) pairs page by page, optionally only the ungraded ones."""
+        sql = ("SELECT anonymous_id, submission, signature, grade FROM submissions "
+               f"WHERE {'grade IS NULL AND ' if ungraded else ''}anonymous_id > ? ORDER BY anonymous_id LIMIT ?")
+        for row in self._pages(sql, (), page_size):
+            yield row[0], _decode_submission(row[1:])
+
+    def publish(self):
+        """Publish the grade of every graded submission; returns the number of published grades."""
+        with self._transaction() as db:
+            db.execute("INSERT OR REPLACE INTO published_grades "
+                       "SELECT anonymous_id, grade FROM submissions WHERE grade IS NOT NULL")
+        return len(self.published_grades)
+
+    def iter_final_grades(self, page_size=None):
+        """Yield (student_id, anonymous_id, grade) for every student's current anonymous ID, page by page."""
+        sql = ("SELECT p.anonymous_id, s.student_id, p.grade FROM published_grades p "
+               "JOIN student_aid_map s ON s.anonymous_id = p.anonymous_id "
+               "WHERE p.anonymous_id > ? ORDER BY p.anonymous_id LIMIT ?")
+        for anonymous_id, student_id, grade in self._pages(sql, (), page_size):
+            yield student_id, anonymous_id, grade
+
+    def close(self):
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,90 @@
+"""
+Batch RSA key generation on a process pool.
+
+generate_keypairs(count, bits) splits the work into chunks of key pairs,
+generates the chunks on a process pool and yields every key pair as soon as
+its chunk is done, so callers can start using keys before the whole batch
+exists. Keys use the fixed public exponent e = 65537, retrying p and q until
+gcd(e, (p-1)(q-1)) = 1. Only when 65537 does not fit below phi (primes of a
+few bits) does a key fall back to the smallest odd e coprime with phi, found
+without building a list of every candidate.
+
+Every chunk gets its own seed, so the same seed gives the same keys whatever
+the number of workers (the order in which they are yielded may differ).
+"""
+import math
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from rsa_toolkit import primes
+from rsa_toolkit.keys import CRTPrivateKey
+
+F4 = 65537
+DEFAULT_CHUNK_SIZE = 16
+
+
+def _small_exponent(phi):
+    """Smallest odd e >= 3 coprime with phi (phi > 2, so phi - 1 always works)."""
+    e = 3
+    while math.gcd(e, phi) != 1:
+        e += 2
+    return e
+
+
+def generate_keypair(bits, e=F4, rng=random):
+    """
+    One RSA key pair with `bits`-bit primes; returns (public_key, CRTPrivateKey).
+
+    p and q are redrawn until they are distinct and e is invertible mod phi.
+    """
+    while True:
+        p = primes.generate_prime(bits, rng=rng)
+        q = primes.generate_prime(bits, rng=rng)
+        if p == q:
+            continue
+        phi = (p - 1) * (q - 1)
+        if phi <= 2:
+            # p, q = 2, 3: only e = d = 1 is left
+            return (1, p * q), CRTPrivateKey(1, p, q)
+        key_e = e if e < phi else _small_exponent(phi)
+        if math.gcd(key_e, phi) == 1:
+            return (key_e, p * q), CRTPrivateKey(pow(key_e, -1, phi), p, q)
+
+
+def _generate_chunk(bits, e, seed, count):
+    """Generate `count` key pairs in a worker from a chunk seed."""
+    rng = random.Random(seed)
+    return [generate_keypair(bits, e, rng) for _ in range(count)]
+
+
+def _chunk_plan(count, chunk_size, seed):
+    """(seed, size) of every chunk; seeds derive from `seed` so runs are reproducible."""
+    rng = random.Random(seed)
+    return [(rng.getrandbits(64), min(chunk_size, count - start))
+            for start in range(0, count, chunk_size)]
+
+
+def generate_keypairs(count, bits, e=F4, workers=None, chunk_size=DEFAULT_CHUNK_SIZE, seed=None):
+    """
+    Yield `count` key pairs (public_key, CRTPrivateKey) as they are generated.
+
+    workers=1 generates them in this process; otherwise a pool of `workers`
+    processes (default: one per CPU) works on chunks of chunk_size keys.
+    """
+    plan = _chunk_plan(count, chunk_size, seed)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for chunk_seed, size in plan:
+            yield from _generate_chunk(bits, e, chunk_seed, size)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    futures = [executor.submit(_generate_chunk, bits, e, chunk_seed, size)
+               for chunk_seed, size in plan]
+    try:
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        # A consumer that stops early should not wait for the rest of the batch
+        executor.shutdown(wait=False, cancel_futures=True)
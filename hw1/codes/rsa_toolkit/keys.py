@@ -0,0 +1,51 @@
+"""
+RSA private keys with Chinese Remainder Theorem (CRT) parameters.
+
+Decrypting with two half-size exponentiations modulo p and q and recombining
+them with Garner's formula is roughly 3-4x faster than one full-size
+pow(c, d, n).
+"""
+from rsa_toolkit import arith
+
+
+class CRTPrivateKey:
+    """
+    Private key storing p, q, dp = d mod (p-1), dq = d mod (q-1) and
+    qinv = q^-1 mod p next to d and n.
+
+    Unpacking still yields (d, n), so code written for the old tuple keys
+    (`d, n = private_key`) keeps working.
+    """
+
+    def __init__(self, d, p, q):
+        if p == q:
+            raise ValueError("CRT needs two distinct primes")
+        self.d = d
+        self.p = p
+        self.q = q
+        self.n = p * q
+        # An exponent of 0 would break c = 0 mod p, (p-1) is equivalent otherwise
+        self.dp = d % (p - 1) or p - 1
+        self.dq = d % (q - 1) or q - 1
+        self.qinv = arith.invert(q, p)
+
+    def __iter__(self):
+        return iter((self.d, self.n))
+
+    def __repr__(self):
+        return f"CRTPrivateKey(d={self.d}, n={self.n})"
+
+    def decrypt(self, c):
+        """m = c^d mod n, computed modulo p and q and recombined (Garner)."""
+        m1 = arith.powmod(c, self.dp, self.p)
+        m2 = arith.powmod(c, self.dq, self.q)
+        h = self.qinv * (m1 - m2) % self.p
+        return m2 + h * self.q
+
+
+def private_decrypt(c, private_key):
+    """Decrypt one integer with either a CRTPrivateKey or a plain (d, n) tuple."""
+    if isinstance(private_key, CRTPrivateKey):
+        return private_key.decrypt(c)
+    d, n = private_key
+    return arith.powmod(c, d, n)
@@ -0,0 +1,135 @@
+"""
+Persistent 2048-bit keys for the anonymous submission protocol.
+
+KeyStore keeps one PEM file per key owner and loads it on first use, so
+participants can be created without touching their keys. KeyPool is a
+FilePool of fresh, unassigned keys that a process pool tops up from a
+background thread. Handing a pooled key to a new owner is a file rename, so
+onboarding a whole course costs seconds as long as the pool was filled
+beforehand (generating a 2048-bit key itself takes tens of milliseconds).
+
+Keys are stored unencrypted (PKCS#8 PEM): this is a course simulation, keep
+the directories private. The cryptography package is only imported when a
+key is generated or loaded.
+"""
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from urllib.parse import quote
+
+from rsa_toolkit.filepool import FilePool, write_atomic
+
+KEY_SIZE = 2048
+PUBLIC_EXPONENT = 65537
+
+
+def generate_pem(key_size=KEY_SIZE):
+    """Generate one private key as PKCS#8 PEM bytes (key objects cannot be pickled to workers)."""
+    from cryptography.hazmat.primitives.asymmetric import rsa
+    from cryptography.hazmat.primitives.serialization import Encoding, NoEncryption, PrivateFormat
+    key = rsa.generate_private_key(public_exponent=PUBLIC_EXPONENT, key_size=key_size)
+    return key.private_bytes(Encoding.PEM, PrivateFormat.PKCS8, NoEncryption())
+
+
+def load_pem(pem):
+    """Parse PEM bytes into a private key object."""
+    from cryptography.hazmat.primitives import serialization
+    return serialization.load_pem_private_key(pem, password=None)
+
+
+class KeyPool(FilePool):
+    """
+    Directory of pre-generated, unassigned private keys (one PEM file each).
+
+    Refills generate keys on a pool of `workers` processes.
+    """
+
+    suffix = ".pem"
+
+    def __init__(self, directory, target_size=64, low_water=16, workers=None, key_size=KEY_SIZE):
+        super().__init__(directory, target_size, low_water)
+        self.workers = workers or os.cpu_count() or 1
+        self.key_size = key_size
+
+    def _generate(self, count):
+        if count == 1:
+            yield generate_pem(self.key_size)
+            return
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = [executor.submit(generate_pem, self.key_size) for _ in range(count)]
+            # Every key is usable as soon as its worker returns it
+            for future in as_completed(futures):
+                yield future.result()
+
+
+class KeyStore:
+    """
+    Private keys by owner, one PEM file per owner in `directory`.
+
+    Keys are read and parsed on first use and then cached in memory.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self._keys = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, owner):
+        return os.path.join(self.directory, quote(owner, safe="") + ".pem")
+
+    def __contains__(self, owner):
+        return owner in self._keys or os.path.exists(self._path(owner))
+
+    def save(self, owner, pem):
+        """Store an owner's private key (PEM bytes)."""
+        write_atomic(self._path(owner), pem)
+        with self._lock:
+            self._keys.pop(owner, None)
+
+    def load(self, owner):
+        """An owner's private key object, or None if the store has none."""
+        with self._lock:
+            key = self._keys.get(owner)
+        if key is not None:
+            return key
+        try:
+            with open(self._path(owner), "rb") as f:
+                key = load_pem(f.read())
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            return self._keys.setdefault(owner, key)
+
+    def get_or_create(self, owner, pool=None):
+        """Load an owner's key, assigning a pooled (or freshly generated) one if missing."""
+        key = self.load(owner)
+        if key is None:
+            self.assign(owner, pool)
+            key = self.load(owner)
+        return key
+
+    def assign(self, owner, pool=None, generate=True):
+        """
+        Give an owner without a key one from the pool (or a new one).
+
+        With generate=False nothing is generated: an owner left without a
+        key when the pool runs dry gets one from get_or_create() on first use.
+        Returns True if a key was assigned.
+        """
+        if owner in self:
+            return False
+        if pool is not None:
+            return pool.take_into(self._path(owner), generate=generate)
+        if not generate:
+            return False
+        write_atomic(self._path(owner), generate_pem())
+        return True
+
+    def assign_many(self, owners, pool):
+        """
+        Hand pooled keys to every owner without one; returns the number assigned.
+
+        Never generates keys inline, so bulk onboarding costs only file moves.
+        """
+        return sum(self.assign(owner, pool, generate=False) for owner in owners)
@@ -0,0 +1,99 @@
+"""
+Optional instrumentation for the attack and key-generation loops.
+
+The instrumented functions take metrics=None. When it is None they run their
+plain loop and pay nothing. When a Metrics object is passed, the loops count
+their work per chunk of CHUNK candidates rather than per candidate, so the
+bookkeeping stays small next to the modexps and divisions themselves:
+
+- counters: candidates, modexp, division, primality_test, primality_reject, ...
+- rate samples: candidates per second, taken at most every sample_interval s
+- timings: seconds spent in named phases (e.g. factorization strategies)
+
+A callback, if given, receives (metrics, event) for every rate sample
+(event "sample") and when a phase is timed (event "timing").
+"""
+import time
+from collections import Counter
+
+# Candidates processed between two counter updates in an instrumented loop
+CHUNK = 1 << 12
+
+
+class Metrics:
+    """Counters, periodic rate samples and phase timings for one run."""
+
+    def __init__(self, sample_interval=1.0, callback=None):
+        self.sample_interval = sample_interval
+        self.callback = callback
+        self.counters = Counter()
+        self.samples = []
+        self.timings = {}
+        self.start = time.perf_counter()
+        self._last_sample = self.start
+        self._last_candidates = 0
+
+    def add(self, name, amount=1):
+        """Increase a counter."""
+        self.counters[name] += amount
+
+    def tested(self, candidates, **operations):
+        """
+        Record `candidates` tested candidates plus the operations they cost
+        (e.g. modexp=candidates), then take a rate sample if one is due.
+        """
+        self.counters["candidates"] += candidates
+        self.counters.update(operations)
+        now = time.perf_counter()
+        if now - self._last_sample >= self.sample_interval:
+            self._sample(now)
+
+    def timing(self, name, seconds):
+        """Record the seconds spent in a named phase."""
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+        if self.callback is not None:
+            self.callback(self, "timing")
+
+    def _sample(self, now):
+        done = self.counters["candidates"] - self._last_candidates
+        self.samples.append({
+            "elapsed": now - self.start,
+            "candidates": self.counters["candidates"],
+            "rate": done / (now - self._last_sample),
+        })
+        self._last_sample = now
+        self._last_candidates = self.counters["candidates"]
+        if self.callback is not None:
+            self.callback(self, "sample")
+
+    def rejection_rate(self):
+        """Fraction of primality-tested candidates that were rejected."""
+        tests = self.counters["primality_test"]
+        return self.counters["primality_reject"] / tests if tests else 0.0
+
+    def report(self):
+        """Snapshot of everything recorded so far, as a plain dict."""
+        elapsed = time.perf_counter() - self.start
+        return {
+            "elapsed": elapsed,
+            "counters": dict(self.counters),
+            "rate": self.counters["candidates"] / elapsed if elapsed > 0 else 0.0,
+            "samples": list(self.samples),
+            "timings": dict(self.timings),
+            "primality_rejection_rate": self.rejection_rate(),
+        }
+
+
+def print_report(metrics):
+    """Print the counters, overall rate and phase timings in the scripts' style."""
+    report = metrics.report()
+    print(f"[+] Metrics after {report['elapsed']:.4f} seconds:")
+    for name, value in sorted(report["counters"].items()):
+        print(f"    -> {name}: {value:,}")
+    if report["counters"].get("candidates"):
+        print(f"    -> overall rate: {report['rate']:,.0f} candidates/s "
+              f"({len(report['samples'])} samples)")
+    if report["counters"].get("primality_test"):
+        print(f"    -> primality rejection rate: {report['primality_rejection_rate']:.1%}")
+    for name, seconds in report["timings"].items():
+        print(f"    -> {name}: {seconds:.6f} seconds")
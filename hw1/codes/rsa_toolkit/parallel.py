@@ -0,0 +1,140 @@
+"""
+Multi-core brute-force search with early cancellation.
+
+The candidate range is split into fixed-size chunks that are handed out to a
+process pool. Workers poll a shared stop event while scanning, so the first
+worker that finds the answer stops every other worker. Each worker's
+candidate count and busy time are collected to report per-worker throughput.
+"""
+import itertools
+import multiprocessing
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from rsa_toolkit import arith, sieve
+
+DEFAULT_CHUNK_SIZE = 1 << 18
+# How many candidates a worker tests between two looks at the stop event
+CHECK_INTERVAL = 1 << 12
+
+_stop_event = None
+
+
+def _init_worker(stop_event):
+    global _stop_event
+    _stop_event = stop_event
+
+
+def _decrypt_predicate(params):
+    ciphertext, e, n = params
+    modexp = arith.modulus_context(n).pow
+    return lambda m: modexp(m, e) == ciphertext
+
+
+def _factor_predicate(params):
+    # With gmpy2, n % i on an mpz is much cheaper than on a large int
+    n = arith.convert(params[0])
+    return lambda i: n % i == 0
+
+
+PREDICATES = {
+    "decrypt": _decrypt_predicate,
+    "factor": _factor_predicate,
+}
+
+# Candidates a worker tests in its chunk [start, stop): every m for decryption,
+# only the primes for factoring (sieved per chunk, like single-core trial division)
+CANDIDATES = {
+    "decrypt": range,
+    "factor": sieve.primes_between,
+}
+
+
+def _scan_chunk(kind, params, start, stop):
+    """Scan the candidates in [start, stop) in a worker; returns (pid, match, tested, seconds)."""
+    matches = PREDICATES[kind](params)
+    candidates = iter(CANDIDATES[kind](start, stop))
+    t0 = time.perf_counter()
+    found = None
+    tested = 0
+
+    while not _stop_event.is_set():
+        block = list(itertools.islice(candidates, CHECK_INTERVAL))
+        if not block:
+            break
+        for index, candidate in enumerate(block):
+            if matches(candidate):
+                found = candidate
+                break
+        if found is not None:
+            tested += index + 1
+            _stop_event.set()
+            break
+        tested += len(block)
+
+    return os.getpid(), found, tested, time.perf_counter() - t0
+
+
+def parallel_search(kind, params, start, stop, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Search [start, stop) on a process pool for a candidate matching `kind`.
+
+    kind is "decrypt" with params (ciphertext, e, n), or "factor" with
+    params (n,), which only tries the primes in the range. Returns (match or None, worker_stats) where worker_stats maps
+    each worker pid to {"candidates", "seconds", "rate"}.
+    """
+    if kind not in PREDICATES:
+        raise ValueError(f"Unknown search kind: {kind}")
+    workers = workers or os.cpu_count() or 1
+
+    stop_event = multiprocessing.Event()
+    stats = {}
+    found = None
+    chunk_starts = iter(range(start, stop, chunk_size))
+
+    def submit_next(pool, pending):
+        chunk_start = next(chunk_starts, None)
+        if chunk_start is not None:
+            chunk_stop = min(chunk_start + chunk_size, stop)
+            pending.add(pool.submit(_scan_chunk, kind, params, chunk_start, chunk_stop))
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(stop_event,)) as pool:
+        # Keep only a bounded window of chunks in flight, the range may be huge
+        pending = set()
+        for _ in range(2 * workers):
+            submit_next(pool, pending)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.cancelled():
+                    continue
+                pid, match, tested, seconds = future.result()
+                worker = stats.setdefault(pid, {"candidates": 0, "seconds": 0.0})
+                worker["candidates"] += tested
+                worker["seconds"] += seconds
+                if match is not None and found is None:
+                    found = match
+            if found is not None:
+                stop_event.set()
+                for future in pending:
+                    future.cancel()
+            else:
+                for _ in done:
+                    submit_next(pool, pending)
+
+    for worker in stats.values():
+        worker["rate"] = worker["candidates"] / worker["seconds"] if worker["seconds"] > 0 else 0.0
+    return found, stats
+
+
+def print_worker_stats(stats):
+    """Print per-worker and aggregate throughput of a parallel search."""
+    total = 0
+    for pid, worker in sorted(stats.items()):
+        total += worker["rate"]
+        print(f"    -> Worker {pid}: {worker['candidates']:,} candidates "
+              f"in {worker['seconds']:.4f}s ({worker['rate']:,.0f} candidates/s)")
+    print(f"    -> Aggregate throughput: {total:,.0f} candidates/s over {len(stats)} workers")
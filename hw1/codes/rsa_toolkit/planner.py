@@ -0,0 +1,190 @@
+"""
+Attack planner: pick the cheapest attack that applies to (e, n, ciphertext).
+
+Weak textbook keys do not need a scan over [0, n):
+
+- identity: with e = 1 the ciphertext is the plaintext
+- integer_root: if m^e < n (or wraps around n only a few times), m is the
+  integer e-th root of c + j*n
+- codebook: the plaintext is one character, so encrypt the whole domain
+- factorization: factor n, derive d and decrypt (needs gcd(e, phi) = 1);
+  only offered while factorization.factorize() would try trial division or
+  Pollard rho within budget
+- exhaustive: try every m in [0, n)
+
+Every attack has a cost model in log10 modular multiplications (a modexp
+with exponent e counts as bits(e) + popcount(e) of them). plan() lists the
+applicable attacks from cheapest to most expensive, and cheapest_attack()
+runs them in that order until one recovers the plaintext. Attacks such as
+integer_root or codebook can fail even when they apply, in which case the
+next one is tried.
+"""
+import math
+import time
+
+from rsa_toolkit import arith, calibration, codebook, factorization
+
+# Multiples of n added to c before giving up on the integer root
+ROOT_WRAPS = 16
+
+# Attacks that finish in (near) constant time whatever the size of n
+CONSTANT_TIME = ("identity", "integer_root")
+
+
+def integer_root(x, k):
+    """Largest r with r**k <= x (Newton's method from above)."""
+    if x < 2 or k == 1:
+        return x
+    if k >= x.bit_length():
+        # 2^k > x, so only 1 fits (and a huge k must never reach r ** (k - 1))
+        return 1
+    r = 1 << -(-x.bit_length() // k)
+    while True:
+        s = ((k - 1) * r + x // r ** (k - 1)) // k
+        if s >= r:
+            return r
+        r = s
+
+
+def modexp_cost(e):
+    """Modular multiplications in one square-and-multiply with exponent e."""
+    return max(e.bit_length() + bin(e).count("1"), 1)
+
+
+def _identity(ciphertext, e, n, domain):
+    return ciphertext
+
+
+def _integer_root(ciphertext, e, n, domain):
+    for wraps in range(ROOT_WRAPS):
+        x = ciphertext + wraps * n
+        m = integer_root(x, e)
+        if m < n and m ** e == x:
+            return m
+    return None
+
+
+def _codebook(ciphertext, e, n, domain):
+    return codebook.get_codebook((e, n), domain).lookup(ciphertext)
+
+
+def _factorization(ciphertext, e, n, domain):
+    factors = factorization.factorize(n)["factors"]
+    if factors is None:
+        return None
+    p, q = factors
+    phi = (p - 1) * (q - 1)
+    if math.gcd(e, phi) != 1:
+        # No unique decryption exponent: the plaintext is not determined by d
+        return None
+    return arith.powmod(ciphertext, arith.invert(e, phi), n)
+
+
+def _exhaustive(ciphertext, e, n, domain):
+    from rsa_toolkit import batch
+    if batch.beats_loop(n):
+        return batch.batch_search(ciphertext, e, n)
+    modexp = arith.modulus_context(n).pow
+    for m in range(n):
+        if modexp(m, e) == ciphertext:
+            return m
+    return None
+
+
+def _identity_cost(e, n, domain):
+    return 0.0, "e = 1: the ciphertext is the plaintext"
+
+
+def _integer_root_cost(e, n, domain):
+    # Newton's method needs about log2(bits) big-number steps per try
+    steps = ROOT_WRAPS * max(math.log2(n.bit_length()), 1) * modexp_cost(e)
+    return math.log10(steps), f"up to {ROOT_WRAPS} integer {e}-th roots of c + j*n"
+
+
+def _codebook_cost(e, n, domain):
+    size = len(codebook.DOMAINS[domain]()) if domain in codebook.DOMAINS else 256
+    return math.log10(size * modexp_cost(e)), f"{size} modexps to encrypt the plaintext domain"
+
+
+def _strategy_ops(name, n):
+    """Operations factorization.factorize(n, "auto") spends in one strategy (its full budget if it fails)."""
+    options = factorization.AUTO_OPTIONS.get(name, {})
+    if name == "trial_division":
+        return 10 ** calibration.log10_trial_division_ops(n.bit_length())
+    if name == "fermat":
+        return options["max_steps"]
+    if name == "pollard_p_minus_1":
+        # The exponent lcm(1..bound) has about bound / ln 2 bits, one squaring each
+        return options["bound"] / math.log(2)
+    # Pollard rho: one squaring and one product per iteration
+    return 2 * factorization.rho_expected_iterations(n)
+
+
+# Strategies that factor any n within their budget (the others need special n)
+GENERAL_FACTORING = ("trial_division", "pollard_rho")
+
+
+def _factorization_applies(e, n, domain):
+    return n > 3 and any(name in GENERAL_FACTORING for name in factorization.select_strategies(n))
+
+
+def _factorization_cost(e, n, domain):
+    # What factorize(n, "auto") actually runs: every selected strategy, in order
+    strategies = factorization.select_strategies(n)
+    ops = sum(_strategy_ops(name, n) for name in strategies)
+    return math.log10(max(ops, 1)), f"factor the {n.bit_length()}-bit n ({', '.join(strategies)}), then one modexp with d"
+
+
+def _exhaustive_cost(e, n, domain):
+    bits = n.bit_length()
+    return (calibration.log10_exhaustive_ops(bits) + math.log10(modexp_cost(e)),
+            f"about n/2 = 2^{bits - 1} modexps")
+
+
+# name -> (applies(e, n, domain), cost(e, n, domain), attack(c, e, n, domain))
+ATTACKS = {
+    "identity": (lambda e, n, domain: e == 1, _identity_cost, _identity),
+    "integer_root": (lambda e, n, domain: e > 1, _integer_root_cost, _integer_root),
+    "codebook": (lambda e, n, domain: domain is not None, _codebook_cost, _codebook),
+    "factorization": (_factorization_applies, _factorization_cost, _factorization),
+    "exhaustive": (lambda e, n, domain: True, _exhaustive_cost, _exhaustive),
+}
+
+
+def plan(public_key, domain="ascii", include=None):
+    """
+    The applicable attacks for public_key, cheapest first.
+
+    Returns a list of {"attack", "log10_cost", "model"} dicts. include
+    restricts the candidates to the given attack names.
+    """
+    e, n = public_key
+    steps = []
+    for name, (applies, cost, _) in ATTACKS.items():
+        if include is not None and name not in include:
+            continue
+        if applies(e, n, domain):
+            log10_cost, model = cost(e, n, domain)
+            steps.append({"attack": name, "log10_cost": log10_cost, "model": model})
+    return sorted(steps, key=lambda step: step["log10_cost"])
+
+
+def cheapest_attack(ciphertext, public_key, domain="ascii", include=None):
+    """
+    Run the planned attacks in cost order until one recovers the plaintext.
+
+    Returns {"plaintext" (None if every attack failed), "attack" (the one
+    that succeeded), "plan" (see plan()) and "timings" (seconds per attack tried)}.
+    """
+    e, n = public_key
+    steps = plan(public_key, domain, include)
+    timings = {}
+    for step in steps:
+        name = step["attack"]
+        start_time = time.perf_counter()
+        m = ATTACKS[name][2](ciphertext, e, n, domain)
+        timings[name] = time.perf_counter() - start_time
+        # A result only counts if it really encrypts to the ciphertext
+        if m is not None and arith.powmod(m, e, n) == ciphertext % n:
+            return {"plaintext": m, "attack": name, "plan": steps, "timings": timings}
+    return {"plaintext": None, "attack": None, "plan": steps, "timings": timings}
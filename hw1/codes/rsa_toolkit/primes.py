@@ -0,0 +1,156 @@
+"""
+Fast random prime generation.
+
+Candidates are forced to be odd and to have exactly the requested bit length,
+are screened with a single gcd against the product of the small primes, and
+only the survivors go through Miller-Rabin. PrimePool keeps pre-generated
+primes per bit length on disk and tops them up from a background thread, so
+benchmark sweeps can draw primes without paying for primality tests. A taken
+prime is removed from disk at once, so no two runs ever share one.
+"""
+import math
+import os
+import random
+import threading
+
+from rsa_toolkit.filepool import FilePool
+from rsa_toolkit.sieve import primes_up_to
+
+SMALL_PRIMES = list(primes_up_to(1000))
+SMALL_PRIMES_PRODUCT = math.prod(SMALL_PRIMES)
+
+# Miller-Rabin with these bases is deterministic for n < 3.3e24
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+RANDOM_ROUNDS = 24
+
+
+def miller_rabin(n, bases):
+    """Return False if any base proves n composite, True otherwise (n odd, n > 3)."""
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_probable_prime(n):
+    """Primality test: small-prime screening followed by Miller-Rabin."""
+    if n < 2:
+        return False
+    if n <= SMALL_PRIMES[-1]:
+        return n in SMALL_PRIMES
+    if math.gcd(n, SMALL_PRIMES_PRODUCT) != 1:
+        return False
+    if n < DETERMINISTIC_LIMIT:
+        return miller_rabin(n, DETERMINISTIC_BASES)
+    bases = [random.randrange(2, n - 1) for _ in range(RANDOM_ROUNDS)]
+    return miller_rabin(n, bases)
+
+
+def random_candidate(bits, rng=random):
+    """Random odd number with exactly `bits` bits (top bit set)."""
+    return rng.getrandbits(bits) | (1 << (bits - 1)) | 1
+
+
+def generate_prime(bits, rng=random, pool=None, metrics=None):
+    """
+    Return a random prime with exactly `bits` bits.
+
+    If a PrimePool is given, the prime is taken from it instead. A Metrics
+    object, if given, counts the primality tests and rejected candidates.
+    """
+    if bits < 2:
+        raise ValueError("There are no primes with fewer than 2 bits")
+    if pool is not None:
+        return pool.take(bits)
+    if bits == 2:
+        # 2-bit primes are only 2 and 3, and 2 is even
+        return rng.choice([2, 3])
+
+    while True:
+        candidate = random_candidate(bits, rng)
+        if metrics is not None:
+            metrics.add("primality_test")
+        if is_probable_prime(candidate):
+            return candidate
+        if metrics is not None:
+            metrics.add("primality_reject")
+
+
+class _BitLengthPool(FilePool):
+    """Pooled primes of one bit length, one decimal text file per prime."""
+
+    suffix = ".prime"
+
+    def __init__(self, directory, bits, target_size, low_water):
+        super().__init__(directory, target_size, low_water)
+        self.bits = bits
+
+    def _generate(self, count):
+        for _ in range(count):
+            yield str(generate_prime(self.bits)).encode("ascii")
+
+
+class PrimePool:
+    """
+    On-disk pool of pre-generated primes, one directory per bit length.
+
+    take() removes a prime (generating one on the spot if the pool is empty)
+    and starts a background refill once fewer than `low_water` remain. Every
+    prime is its own file and is claimed by renaming it, so processes sharing
+    the directory never get the same prime: keys built from a shared prime
+    are broken by a single gcd of their moduli.
+    """
+
+    def __init__(self, directory, target_size=64, low_water=16):
+        self.directory = directory
+        self.target_size = target_size
+        self.low_water = low_water
+        self._pools = {}
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _pool(self, bits):
+        with self._lock:
+            pool = self._pools.get(bits)
+            if pool is None:
+                pool = _BitLengthPool(os.path.join(self.directory, f"primes_{bits}"), bits,
+                                      self.target_size, self.low_water)
+                self._pools[bits] = pool
+            return pool
+
+    def __len__(self):
+        with self._lock:
+            pools = list(self._pools.values())
+        return sum(pool.available() for pool in pools)
+
+    def available(self, bits):
+        """Number of primes of this bit length currently in the pool."""
+        return self._pool(bits).available()
+
+    def take(self, bits):
+        """Remove and return one prime with exactly `bits` bits."""
+        return int(self._pool(bits).take())
+
+    def refill(self, bits, background=False):
+        """Top the pool for `bits` up to target_size, optionally on a daemon thread."""
+        return self._pool(bits).refill(background)
+
+    def wait(self):
+        """Block until every running background refill has finished."""
+        with self._lock:
+            pools = list(self._pools.values())
+        for pool in pools:
+            pool.wait()
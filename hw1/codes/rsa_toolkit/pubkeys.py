@@ -0,0 +1,76 @@
+"""
+Bounded LRU cache of parsed public keys, keyed by PEM fingerprint.
+
+Parsing a PEM public key is far more expensive than hashing it, and the
+protocol sees the same few keys over and over (every signature check and
+every encryption carries the sender's or recipient's PEM). The cache maps
+SHA-256(PEM) to the parsed key object, evicting the least recently used
+entry beyond maxsize, and counts hits and misses. It is safe to share
+between threads.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 4096
+
+
+def fingerprint(pem):
+    """SHA-256 hex digest of a PEM (bytes or str)."""
+    if isinstance(pem, str):
+        pem = pem.encode("ascii")
+    return hashlib.sha256(pem).hexdigest()
+
+
+class PublicKeyCache:
+    """LRU cache from PEM fingerprint to parsed public key."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def get(self, pem):
+        """The parsed public key for a PEM, parsing it only on a cache miss."""
+        key_id = fingerprint(pem)
+        with self._lock:
+            key = self._keys.get(key_id)
+            if key is not None:
+                self._keys.move_to_end(key_id)
+                self.hits += 1
+                return key
+            self.misses += 1
+
+        from cryptography.hazmat.primitives import serialization
+        key = serialization.load_pem_public_key(pem.encode("ascii") if isinstance(pem, str) else pem)
+
+        with self._lock:
+            self._keys[key_id] = key
+            self._keys.move_to_end(key_id)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        return key
+
+    def stats(self):
+        """Hit/miss counters, hit rate and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size": len(self._keys),
+                "maxsize": self.maxsize,
+            }
+
+    def clear(self):
+        """Drop every cached key and reset the counters."""
+        with self._lock:
+            self._keys.clear()
+            self.hits = 0
+            self.misses = 0
@@ -0,0 +1,191 @@
+"""
+Plots, tables and cracking-time reports for the brute-force sweep.
+
+matplotlib and tabulate are imported inside the functions that use them, so
+importing the package does not pay for them.
+"""
+import math
+
+from rsa_toolkit import calibration, store
+
+
+def plot_and_save_results(results_path, dpi=300, plot_path='rsa_brute_force_times.png',
+                          table_path='rsa_brute_force_results.txt'):
+    """
+    Plot the brute force times from a results file or JSONL store and save them to files.
+
+    Rendering uses the non-interactive Agg backend, so it runs headless and
+    can be repeated on its own from the store; every run in the store (e.g.
+    one per machine after a merge) gets its own line and table rows.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from tabulate import tabulate
+    
+    runs = store.load_runs(results_path)
+    all_times = [entry["median_s"] for _, entries in runs for entry in entries]
+    plt.figure(figsize=(10, 6))
+    
+    for run, entries in runs:
+        bit_lengths = [entry["bits"] for entry in entries]
+        times = [entry["median_s"] for entry in entries]
+        iqrs = [entry["iqr_s"] for entry in entries]
+        
+        # Create the plot (median per configuration, IQR as error bars)
+        plt.errorbar(bit_lengths, times, yerr=[iqr / 2 for iqr in iqrs],
+                     fmt='o-', linewidth=2, markersize=8, capsize=4,
+                     label=f"{run['host']} ({run['id']})")
+        
+        # Add annotations for each point
+        for bits, t in zip(bit_lengths, times):
+            plt.annotate(f"{t:.4f}s", 
+                         (bits, t),
+                         textcoords="offset points", 
+                         xytext=(0,10), 
+                         ha='center')
+    plt.title('RSA Brute Force Attack Time vs Key Size', fontsize=16)
+    plt.xlabel('Key Size (bits)', fontsize=14)
+    plt.ylabel('Time (seconds)', fontsize=14)
+    plt.grid(True)
+    if len(runs) > 1:
+        plt.legend()
+    
+    # Set x-ticks to match our bit lengths
+    plt.xticks(sorted({entry["bits"] for _, entries in runs for entry in entries}))
+    
+    # Use log scale for y-axis if the times span several orders of magnitude
+    if max(all_times) / (min(all_times) + 1e-10) > 100:  # Add small value to avoid division by zero
+        plt.yscale('log')
+        plt.ylabel('Time (seconds, log scale)', fontsize=14)
+    
+    # Save the figure
+    plt.tight_layout()
+    plt.savefig(plot_path, dpi=dpi)
+    plt.close()
+    print(f"[✓] Plot saved as '{plot_path}'")
+    
+    # Also save the data as a table in a text file
+    with open(table_path, 'w') as f:
+        f.write("RSA Brute Force Attack Times\n")
+        f.write("============================\n")
+        for run, entries in runs:
+            table_data = [[entry["bits"], f"{entry['median_s']:.6f}", f"{entry['iqr_s']:.6f}",
+                           f"{entry['min_s']:.6f}", len(entry["times_ns"])] for entry in entries]
+            f.write(f"\nRun {run['id']} on {run['host']}\n")
+            f.write(f"Seed: {run['seed']}, warmup runs: {run['warmup']}, "
+                    f"timed runs: {run['repeats']}, machine: {run['machine']}\n\n")
+            f.write(tabulate(table_data, headers=["Bit Length", "Median (s)", "IQR (s)", "Min (s)", "Runs"],
+                             tablefmt="grid"))
+            
+            # Calculate time ratios between consecutive bit lengths
+            f.write("\n\nTime Ratios (showing exponential growth):\n")
+            f.write("=======================================\n\n")
+            ratios = []
+            for previous, entry in zip(entries, entries[1:]):
+                ratio = entry["median_s"] / max(previous["median_s"], 1e-10)  # Avoid division by zero
+                ratios.append([f"{previous['bits']} to {entry['bits']}", f"{ratio:.2f}x"])
+            
+            f.write(tabulate(ratios, headers=["Bit Length Increase", "Time Ratio"], tablefmt="grid"))
+            f.write("\n")
+    
+    print(f"[✓] Detailed results saved as '{table_path}'")
+
+def estimate_supercomputer_cracking_time(target_bits=256, calibration_path='calibration.json'):
+    """
+    Estimate the time it would take for a supercomputer to crack a target_bits RSA key.
+
+    The local machine is calibrated (modexp and trial-division rates with 95%
+    confidence intervals) and every attack is extrapolated with its own
+    complexity model: exhaustive search O(n), trial division O(sqrt n) and
+    GNFS L-notation. The supercomputer is modelled as its core count of
+    local-speed cores working in parallel.
+    """
+    from tabulate import tabulate
+    
+    # Choose a supercomputer for comparison
+    supercomputer = {
+        "name": "Frontier (ORNL)",
+        "peak_performance": 1.102e18,  # FLOPS (floating-point operations per second)
+        "cores": 8699904,  # CPU cores
+        "memory": "700 TB",
+        "year": 2022,
+        "location": "Oak Ridge National Laboratory, USA"
+    }
+    
+    # Measure this machine at the operand sizes the models need
+    table = calibration.calibrate(sorted({64, target_bits // 2, target_bits}), output_path=calibration_path)
+    local_estimates = calibration.estimate(target_bits, table)
+    
+    # The attacks split into independent work units, so cores add up linearly
+    speedup_factor = supercomputer["cores"]
+    log10_speedup = math.log10(speedup_factor)
+    supercomputer_estimates = {name: tuple(t - log10_speedup for t in times)
+                               for name, times in local_estimates.items()}
+    
+    def format_interval(times):
+        mean, low, high = times
+        return (f"{calibration.format_log10_seconds(mean)} "
+                f"(95% CI {calibration.format_log10_seconds(low)} .. {calibration.format_log10_seconds(high)})")
+    
+    # Write results to a file
+    with open('supercomputer_comparison.txt', 'w') as f:
+        f.write(f"Estimating Time to Crack {target_bits}-bit RSA\n")
+        f.write("===================================\n\n")
+        
+        f.write("Supercomputer Specifications:\n")
+        f.write(f"  Name: {supercomputer['name']}\n")
+        f.write(f"  Peak Performance: {supercomputer['peak_performance']:.2e} FLOPS\n")
+        f.write(f"  CPU Cores: {supercomputer['cores']:,}\n")
+        f.write(f"  Memory: {supercomputer['memory']}\n")
+        f.write(f"  Year: {supercomputer['year']}\n")
+        f.write(f"  Location: {supercomputer['location']}\n\n")
+        
+        f.write("Measured Local Throughput (per core, 95% CI):\n")
+        calibration_rows = [[bits, f"{rates['modexp'][0]:,.0f} ({rates['modexp'][1]:,.0f} .. {rates['modexp'][2]:,.0f})",
+                             f"{rates['division'][0]:,.0f} ({rates['division'][1]:,.0f} .. {rates['division'][2]:,.0f})"]
+                            for bits, rates in table.items()]
+        f.write(tabulate(calibration_rows, headers=["Operand Bits", "Modexp/s", "Divisions/s"], tablefmt="grid"))
+        f.write("\n\n")
+        
+        f.write("Cracking Time Estimates:\n")
+        for name in local_estimates:
+            f.write(f"  {name}:\n")
+            f.write(f"    Your Machine: {format_interval(local_estimates[name])}\n")
+            f.write(f"    {supercomputer['name']}: {format_interval(supercomputer_estimates[name])}\n")
+        f.write("\n")
+        
+        f.write("Speed-up Factor:\n")
+        f.write(f"  {supercomputer['name']} runs approximately {speedup_factor:.2e} cores in parallel\n")
+        f.write(f"  GNFS is anchored to the RSA-768 record (~2000 core-years), within a factor of "
+                f"{calibration.GNFS_ANCHOR_UNCERTAINTY:g}\n\n")
+        
+        # Add context on the security implications, based on the cheapest attack
+        fastest = min(supercomputer_estimates.values())[0]
+        f.write("Security Context:\n")
+        if fastest < math.log10(86400*365*100):  # If less than 100 years
+            f.write("  WARNING: This key size might be vulnerable to a determined attacker with access\n")
+            f.write("  to supercomputing resources. Modern RSA implementations typically use 2048-bit\n")
+            f.write("  or 4096-bit keys to ensure long-term security.\n")
+        else:
+            f.write(f"  Even with a leading supercomputer, breaking this {target_bits}-bit RSA key would take an\n")
+            f.write("  astronomical amount of time, making it computationally secure against brute force.\n")
+            f.write("  However, typical RSA implementations use 2048-bit or 4096-bit keys to protect\n")
+            f.write("  against future computing advances and mathematical breakthroughs.\n")
+            
+        # Add note about quantum computing
+        f.write("\nNote on Quantum Computing:\n")
+        f.write("  Quantum computers using Shor's algorithm could theoretically break RSA encryption\n")
+        f.write("  much faster. A sufficiently powerful quantum computer could factor an RSA-256 key\n")
+        f.write("  in seconds to minutes. However, current quantum computers are not yet capable of\n")
+        f.write("  breaking RSA keys of any practical size.\n")
+    
+    print(f"[✓] Supercomputer comparison results saved as 'supercomputer_comparison.txt'")
+    
+    return {
+        "local_log10_seconds": local_estimates,
+        "supercomputer_log10_seconds": supercomputer_estimates,
+        "speedup_factor": speedup_factor,
+        "calibration": table,
+        "supercomputer": supercomputer
+    }
@@ -0,0 +1,125 @@
+"""
+Lazy prime and wheel generators used to drive trial division.
+
+primes_up_to() is a segmented sieve of Eratosthenes: it only stores odd
+numbers (one byte flag each) for one cache-sized segment at a time and the
+sieving primes up to the square root of the current segment, which are
+produced by the same generator recursively. Memory therefore stays bounded
+even when the limit runs into the billions.
+"""
+import array
+import itertools
+import math
+
+# 32 KiB of flags per segment, i.e. 64Ki numbers, small enough for L1/L2 caches
+SEGMENT_BYTES = 1 << 15
+
+# Odd primes found for primes_between() in this process, complete up to _sieved_to
+_sieving_cache = array.array("Q")
+_sieved_to = 2
+
+WHEEL_BASIS = (2, 3, 5)
+
+
+def primes_up_to(limit, segment_size=SEGMENT_BYTES):
+    """Yield every prime <= limit in increasing order."""
+    if limit < 2:
+        return
+    yield 2
+
+    # Odd sieving primes, pulled lazily from a sieve over sqrt(limit)
+    sieving_primes = []
+    source = primes_up_to(math.isqrt(limit), segment_size)
+    next(source, None)  # skip 2, the segments only hold odd numbers
+    pending = next(source, None)
+
+    low = 3
+    while low <= limit:
+        high = min(low + 2 * segment_size, limit + 1)
+        while pending is not None and pending * pending < high:
+            sieving_primes.append(pending)
+            pending = next(source, None)
+        yield from _sieve_odd_segment(low, high, sieving_primes)
+        low += 2 * segment_size
+
+
+def primes_between(low, high, segment_size=SEGMENT_BYTES):
+    """
+    Yield every prime p with low <= p < high in increasing order.
+
+    Only the window is sieved, so workers can each take one slice of a
+    long range. The primes up to sqrt(high) are kept between calls and only
+    extended as the windows move up.
+    """
+    if low <= 2 < high:
+        yield 2
+    low = max(low, 3) | 1
+    if low >= high:
+        return
+    sieving_primes = _odd_primes_up_to(math.isqrt(high - 1), segment_size)
+    while low < high:
+        segment_high = min(low + 2 * segment_size, high)
+        yield from _sieve_odd_segment(low, segment_high, sieving_primes)
+        low = segment_high
+
+
+def _odd_primes_up_to(limit, segment_size=SEGMENT_BYTES):
+    """
+    The cached odd primes, extended to cover every odd prime <= limit.
+
+    The array may also hold primes above limit; _sieve_odd_segment() stops
+    at the first prime whose square passes the segment.
+    """
+    global _sieved_to
+    if limit > _sieved_to:
+        # Sieving up to limit needs the primes up to sqrt(limit) first
+        _odd_primes_up_to(math.isqrt(limit), segment_size)
+        low = (_sieved_to + 1) | 1
+        while low <= limit:
+            high = min(low + 2 * segment_size, limit + 1)
+            _sieving_cache.extend(_sieve_odd_segment(low, high, _sieving_cache))
+            low = high if high % 2 else high + 1
+        _sieved_to = limit
+    return _sieving_cache
+
+
+def _sieve_odd_segment(low, high, sieving_primes):
+    """Yield the primes among the odd numbers in [low, high), for odd low >= 3 and sorted odd sieving primes."""
+    count = (high - low + 1) // 2
+    # flags[i] stands for the odd number low + 2 * i
+    flags = bytearray(b"\x01") * count
+    for p in sieving_primes:
+        if p * p >= high:
+            break
+        start = max(p * p, -(-low // p) * p)
+        if start % 2 == 0:
+            start += p
+        if start >= high:
+            continue
+        first = (start - low) // 2
+        # Consecutive odd multiples of p are p flags apart
+        flags[first::p] = bytes(len(range(first, count, p)))
+    return itertools.compress(range(low, high, 2), flags)
+
+
+def wheel_candidates(limit, basis=WHEEL_BASIS):
+    """
+    Yield the basis primes, then every number <= limit coprime to them.
+
+    With the default (2, 3, 5) wheel only 8 out of every 30 integers are
+    produced; composites remain, but no sieve has to be kept in memory.
+    """
+    modulus = math.prod(basis)
+    residues = [r for r in range(1, modulus + 1) if math.gcd(r, modulus) == 1]
+
+    for p in basis:
+        if p > limit:
+            return
+        yield p
+    for base in itertools.count(0, modulus):
+        for r in residues:
+            candidate = base + r
+            if candidate > limit:
+                return
+            if candidate > 1:
+                yield candidate
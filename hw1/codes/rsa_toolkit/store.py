@@ -0,0 +1,92 @@
+"""
+Append-only JSONL store for sweep measurements.
+
+Every configuration is written as one JSON line as soon as it has been
+measured (flushed and fsynced), so a crash at a large bit length keeps all
+the smaller ones. Each line carries its run: a random run id, the host name
+and the benchmark settings, which lets stores from several machines be
+merged into one file and plotted side by side.
+
+A half-written line (from a crash mid-write) is skipped when reading, and
+the next append starts on a fresh line so it does not glue onto it.
+"""
+import json
+import os
+import platform
+import uuid
+from datetime import datetime
+
+
+def new_run(**config):
+    """Run metadata stored with every record: id, host, start time and the given settings."""
+    return dict(config, id=uuid.uuid4().hex[:12], host=platform.node(),
+                started=datetime.now().isoformat())
+
+
+def append_record(path, record):
+    """Append one record as a JSON line and make sure it reaches the disk."""
+    line = (json.dumps(record) + "\n").encode()
+    with open(path, "ab+") as f:
+        if f.seek(0, os.SEEK_END) > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                # The previous writer died mid-line
+                line = b"\n" + line
+        f.write(line)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_records(path):
+    """Yield the records of a store, skipping half-written lines."""
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                print(f"[!] Skipping a truncated record on line {number} of '{path}'")
+
+
+def merge_stores(paths, output_path):
+    """
+    Merge several stores into output_path; returns the number of records.
+
+    Records are deduplicated by (run id, bits), so merging the same store
+    twice (or merging into one of the inputs) is harmless.
+    """
+    merged = {}
+    for path in paths:
+        for record in read_records(path):
+            merged[(record["run"]["id"], record["bits"])] = record
+    records = sorted(merged.values(), key=lambda r: (r["run"]["started"], r["run"]["id"], r["bits"]))
+
+    tmp_path = output_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+    os.replace(tmp_path, output_path)
+    return len(records)
+
+
+def load_runs(path):
+    """
+    Group the measurements of a store by run.
+
+    Returns a list of (run metadata, entries sorted by bits). A .json file
+    written by benchmark.run_benchmark is read as a single run.
+    """
+    if path.endswith(".json"):
+        with open(path) as f:
+            data = json.load(f)
+        config = data["config"]
+        run = dict(config, id=config.get("run_id", "results"), host=config.get("host", "local"))
+        return [(run, data["results"])]
+
+    runs = {}
+    for record in read_records(path):
+        run = record["run"]
+        runs.setdefault(run["id"], (run, []))[1].append(record)
+    return [(run, sorted(entries, key=lambda entry: entry["bits"]))
+            for run, entries in sorted(runs.values(), key=lambda item: item[0]["started"])]
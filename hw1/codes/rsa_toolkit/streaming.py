@@ -0,0 +1,120 @@
+"""
+Streaming block-mode RSA for files of any size.
+
+Files are read through mmap (or plain fixed-size reads when mmap is not
+possible), cut into RSA blocks by a chain of generators and written out
+incrementally, so memory use does not depend on the file size. The output
+format is exactly the one produced by blocks.encrypt_bytes.
+"""
+import itertools
+import mmap
+import os
+
+from rsa_toolkit import arith
+from rsa_toolkit.blocks import (LENGTH_BYTES, ciphertext_block_size, decrypt_block,
+                                encrypt_block, plaintext_block_size)
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+
+def iter_file_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=True):
+    """Yield the contents of a file as bytes chunks of at most chunk_size."""
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if use_mmap and size > 0:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in range(0, size, chunk_size):
+                    # Slicing an mmap copies, so no view outlives the mapping
+                    yield mm[offset:offset + chunk_size]
+        else:
+            while chunk := f.read(chunk_size):
+                yield chunk
+
+
+def iter_blocks(chunks, size, pad=False):
+    """
+    Re-cut a stream of chunks into blocks of exactly `size` bytes.
+
+    The last block may be shorter, unless pad=True zero-fills it.
+    """
+    buffer = bytearray()
+    for chunk in chunks:
+        buffer += chunk
+        usable = len(buffer) - len(buffer) % size
+        for offset in range(0, usable, size):
+            yield bytes(buffer[offset:offset + size])
+        del buffer[:usable]
+    if buffer:
+        if pad:
+            buffer += bytes(size - len(buffer))
+        yield bytes(buffer)
+
+
+def unframe(blocks):
+    """Strip the length header from decrypted blocks and drop the zero padding."""
+    header = bytearray()
+    remaining = None
+    for block in blocks:
+        if remaining is None:
+            header += block
+            if len(header) < LENGTH_BYTES:
+                continue
+            remaining = int.from_bytes(header[:LENGTH_BYTES], "big")
+            block = bytes(header[LENGTH_BYTES:])
+        piece = block[:remaining]
+        remaining -= len(piece)
+        if piece:
+            yield piece
+        if remaining == 0:
+            return
+    if remaining is None or remaining > 0:
+        raise ValueError("Truncated ciphertext: stream ended before the framed length")
+
+
+def write_chunks(path, chunks):
+    """Write a stream of bytes chunks to a file; returns the number of bytes written."""
+    written = 0
+    with open(path, "wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+            written += len(chunk)
+    return written
+
+
+def encrypt_stream(chunks, length, public_key):
+    """Yield the ciphertext blocks for a plaintext stream of `length` bytes."""
+    e, n = public_key
+    k = plaintext_block_size(n)
+    out_size = ciphertext_block_size(n)
+    framed = itertools.chain([length.to_bytes(LENGTH_BYTES, "big")], chunks)
+    modexp = arith.modulus_context(n).pow
+    for block in iter_blocks(framed, k, pad=True):
+        yield encrypt_block(block, e, n, out_size, modexp)
+
+
+def decrypt_stream(chunks, private_key):
+    """Yield the plaintext pieces for a stream of ciphertext chunks."""
+    _, n = private_key
+    k = plaintext_block_size(n)
+    in_size = ciphertext_block_size(n)
+
+    def plaintext_blocks():
+        for block in iter_blocks(chunks, in_size):
+            if len(block) != in_size:
+                raise ValueError(f"Ciphertext length is not a multiple of the block size {in_size}")
+            yield decrypt_block(block, private_key, k)
+
+    return unframe(plaintext_blocks())
+
+
+def encrypt_file(src_path, dst_path, public_key, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Encrypt a file block by block; returns the number of ciphertext bytes written."""
+    length = os.path.getsize(src_path)
+    chunks = iter_file_chunks(src_path, chunk_size)
+    return write_chunks(dst_path, encrypt_stream(chunks, length, public_key))
+
+
+def decrypt_file(src_path, dst_path, private_key, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Decrypt a file produced by encrypt_file; returns the number of plaintext bytes written."""
+    chunks = iter_file_chunks(src_path, chunk_size)
+    return write_chunks(dst_path, decrypt_stream(chunks, private_key))
@@ -0,0 +1,93 @@
+"""
+The HW1 brute-force sweep: one benchmark configuration per prime size.
+
+Run it with `python -m rsa_toolkit` (or the ceng418_hw1_v1.py script).
+Measurements are appended to a JSONL store as they are taken; the plot and
+tables can be regenerated from it (`--render`), also after merging the
+stores of several machines (`--merge`).
+"""
+import argparse
+import functools
+import os
+
+from rsa_toolkit import benchmark, primes, store
+from rsa_toolkit.core import budgeted_brute_force, encrypt_message, generate_rsa_keys
+from rsa_toolkit.reporting import estimate_supercomputer_cracking_time, plot_and_save_results
+
+BIT_LENGTHS = [2, 4, 8, 16, 32, 64, 128, 256, 512]
+RESULTS_PATH = 'rsa_brute_force_results.json'
+STORE_PATH = 'rsa_brute_force_results.jsonl'
+# Deadline for every timed brute-force scan in the sweep
+SWEEP_MAX_SECONDS = 60
+
+
+def setup_sweep_case(bits, pool=None):
+    """Generate a key pair for one sweep configuration (primes from pool, if given) and encrypt 'A'."""
+    print("="*50)
+    print(f"[*] Testing {bits}-bit RSA key pair")
+    pub, priv = generate_rsa_keys(bits, pool=pool)
+    cipher = encrypt_message("A", pub)
+    return cipher, pub
+
+def attack_sweep_case(cipher, pub):
+    """Brute-force one sweep configuration; returns the search outcome."""
+    from rsa_toolkit import batch, planner
+    
+    # Weak keys (e = 1, or m^e barely above n) fall to a constant-time attack: don't time a scan
+    weak = planner.cheapest_attack(cipher, pub, include=planner.CONSTANT_TIME)
+    if weak["plaintext"] is not None:
+        return {"found": weak["plaintext"], "engine": weak["attack"]}
+    # Every size is scanned under a deadline and reports its rate and how much
+    # of [0, n) it covered; moduli the uint64 engine cannot win on use the Python loop
+    engine = "numpy" if batch.beats_loop(pub[1]) else "python"
+    progress = budgeted_brute_force(cipher, pub, max_seconds=SWEEP_MAX_SECONDS, engine=engine)
+    return dict(progress, engine=engine)
+
+def main(argv=None):
+    """Run the sweep, then plot it and write the cracking-time estimates."""
+    parser = argparse.ArgumentParser(description="RSA brute-force sweep (CENG418 HW1)")
+    parser.add_argument("--bits", type=int, nargs="+", default=BIT_LENGTHS,
+                        help="prime sizes to test")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per configuration")
+    parser.add_argument("--warmup", type=int, default=1, help="untimed runs per configuration")
+    parser.add_argument("--seed", type=int, default=418, help="base random seed")
+    parser.add_argument("--output", default=RESULTS_PATH, help="JSON results file")
+    parser.add_argument("--target-bits", type=int, default=256,
+                        help="modulus size for the cracking-time estimate")
+    parser.add_argument("--store", default=STORE_PATH,
+                        help="JSONL store every measurement is appended to")
+    parser.add_argument("--render", action="store_true",
+                        help="only regenerate the plot and tables from the store")
+    parser.add_argument("--merge", nargs="+", metavar="STORE",
+                        help="merge these stores into --store, then render")
+    parser.add_argument("--dpi", type=int, default=300, help="plot resolution")
+    parser.add_argument("--prime-pool", metavar="DIR",
+                        help="draw primes from an on-disk pool in DIR (keys then no longer follow --seed)")
+    args = parser.parse_args(argv)
+    
+    if args.merge:
+        count = store.merge_stores(args.merge + [args.store] * os.path.exists(args.store), args.store)
+        print(f"[✓] Merged {count} records into '{args.store}'")
+    if args.merge or args.render:
+        plot_and_save_results(args.store, dpi=args.dpi)
+        return
+    
+    setup = setup_sweep_case
+    pool = None
+    if args.prime_pool:
+        # low_water=0: no background refill competes with the timed scans
+        pool = primes.PrimePool(args.prime_pool, low_water=0)
+        setup = functools.partial(setup_sweep_case, pool=pool)
+    
+    benchmark.run_benchmark(args.bits, setup, attack_sweep_case,
+                            repeats=args.repeats, warmup=args.warmup, seed=args.seed,
+                            output_path=args.output, store_path=args.store)
+    
+    if pool is not None:
+        # Top the pool up after the measurements, so the next sweep draws from disk
+        for bits in args.bits:
+            pool.refill(bits)
+        print(f"[✓] Prime pool '{args.prime_pool}' holds {len(pool)} primes")
+    
+    plot_and_save_results(args.store, dpi=args.dpi)
+    estimate_supercomputer_cracking_time(args.target_bits)
@@ -0,0 +1,378 @@
+"""
+Asyncio network front-end for the anonymous submission protocol.
+
+The server exposes an Instructor over TCP or a Unix socket. Every message is
+a 4-byte big-endian length followed by a JSON object; byte strings
+(signatures, ciphertexts, PEM keys) travel base64-encoded. Requests:
+
+    {"op": "instructor_key"}                                   -> {"ok", "public_key_pem"}
+    {"op": "request_anonymous_id", "request_json", "signature", "public_key_pem"}
+                                                               -> {"ok", "encrypted_aid", "signature"}
+    {"op": "submit", "submission_str", "signature", "public_key_pem"} -> {"ok"}
+    {"op": "grades"}                                           -> {"ok", "grades"}
+
+The RSA work (signature checks, encryption, signing) runs on a thread pool
+executor, since OpenSSL releases the GIL, so the event loop keeps serving
+other connections in the meantime. Clients share a pool of connections.
+The load generator drives a server with many concurrent clients and
+reports requests per second and latency percentiles.
+
+    python submission_server.py serve --port 8418 --gradebook semester.db
+    python submission_server.py load --port 8418 --clients 32 --requests 2000
+    python submission_server.py load --spawn --unix /tmp/submissions.sock
+"""
+import argparse
+import asyncio
+import base64
+import contextlib
+import json
+import os
+import statistics
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from anonymous_submission_protocol import Instructor, Student
+from rsa_toolkit.gradebook import SQLiteGradebook
+
+HEADER = struct.Struct(">I")
+MAX_FRAME = 64 << 20
+DEFAULT_PORT = 8418
+
+
+def b64(data):
+    return base64.b64encode(data).decode('ascii')
+
+
+def unb64(text):
+    return base64.b64decode(text)
+
+
+async def read_frame(reader):
+    """Read one length-prefixed JSON message; None when the peer closed the connection, even mid-frame."""
+    try:
+        header = await reader.readexactly(HEADER.size)
+        (length,) = HEADER.unpack(header)
+        if length > MAX_FRAME:
+            raise ValueError(f"Frame of {length} bytes exceeds the {MAX_FRAME}-byte limit")
+        body = await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+    return json.loads(body)
+
+
+def write_frame(writer, message):
+    """Queue one length-prefixed JSON message on a stream writer."""
+    body = json.dumps(message).encode('utf-8')
+    writer.write(HEADER.pack(len(body)) + body)
+
+
+class SubmissionServer:
+    """Serves one Instructor; RSA-heavy handlers run on a thread pool."""
+
+    def __init__(self, instructor, max_workers=None):
+        self.instructor = instructor
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.requests = 0
+        self.listener = None
+        self._connections = set()
+        self.handlers = {
+            "instructor_key": self.handle_instructor_key,
+            "request_anonymous_id": self.handle_request_anonymous_id,
+            "submit": self.handle_submit,
+            "grades": self.handle_grades,
+        }
+
+    async def run_in_executor(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    async def handle_instructor_key(self, message):
+        return {"ok": True, "public_key_pem": self.instructor.get_public_key_pem().decode('ascii')}
+
+    async def handle_request_anonymous_id(self, message):
+        response = await self.run_in_executor(
+            self.instructor.process_anonymous_id_request,
+            message["request_json"],
+            unb64(message["signature"]),
+            message["public_key_pem"].encode('ascii')
+        )
+        if not response:
+            return {"ok": False}
+        encrypted_aid, signature = response
+        return {"ok": True, "encrypted_aid": b64(encrypted_aid), "signature": b64(signature)}
+
+    async def handle_submit(self, message):
+        ok = await self.run_in_executor(
+            self.instructor.receive_submission,
+            message["submission_str"],
+            unb64(message["signature"]),
+            message["public_key_pem"].encode('ascii')
+        )
+        return {"ok": ok}
+
+    async def handle_grades(self, message):
+        # A persistent gradebook reads the grades from disk: keep that off the event loop
+        grades = await self.run_in_executor(lambda: dict(self.instructor.get_published_grades().items()))
+        return {"ok": True, "grades": grades}
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it."""
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while (message := await read_frame(reader)) is not None:
+                op = message.get("op") if isinstance(message, dict) else None
+                handler = self.handlers.get(op) if isinstance(op, str) else None
+                if not isinstance(message, dict):
+                    response = {"ok": False, "error": "bad request: expected a JSON object"}
+                elif handler is None:
+                    response = {"ok": False, "error": f"unknown op: {op}"}
+                else:
+                    try:
+                        response = await handler(message)
+                    except (KeyError, ValueError, TypeError, AttributeError) as e:
+                        # Missing fields, or fields of the wrong type
+                        response = {"ok": False, "error": f"bad request: {e!r}"}
+                self.requests += 1
+                write_frame(writer, response)
+                await writer.drain()
+        except (ConnectionResetError, ValueError) as e:
+            print(f"[Server] Dropping connection: {e}")
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionResetError, BrokenPipeError):
+                await writer.wait_closed()
+            self._connections.discard(task)
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None):
+        """Start listening; returns the asyncio server."""
+        if unix_path is not None:
+            with contextlib.suppress(FileNotFoundError):
+                os.unlink(unix_path)
+            self.listener = await asyncio.start_unix_server(self.handle_connection, path=unix_path)
+        else:
+            self.listener = await asyncio.start_server(self.handle_connection, host, port)
+        return self.listener
+
+    async def stop(self):
+        """Stop listening, let open connections finish and shut the thread pool down."""
+        if self.listener is not None:
+            self.listener.close()
+            await self.listener.wait_closed()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        self.executor.shutdown()
+
+
+class ConnectionPool:
+    """
+    Up to `size` open connections to the server, shared by concurrent requests.
+
+    A semaphore bounds the requests in flight. A request reuses an idle
+    connection or opens a new one; a connection that fails is dropped and
+    its slot released, so the next waiter opens a replacement.
+    """
+
+    def __init__(self, host="127.0.0.1", port=DEFAULT_PORT, unix_path=None, size=8):
+        self.host = host
+        self.port = port
+        self.unix_path = unix_path
+        self.size = size
+        self._slots = asyncio.Semaphore(size)
+        self._idle = []
+
+    async def _open(self):
+        if self.unix_path is not None:
+            return await asyncio.open_unix_connection(self.unix_path)
+        return await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, message):
+        """Send one request on a pooled connection and return the response."""
+        async with self._slots:
+            reader, writer = self._idle.pop() if self._idle else await self._open()
+            try:
+                write_frame(writer, message)
+                await writer.drain()
+                response = await read_frame(reader)
+                if response is None:
+                    raise ConnectionError("Server closed the connection")
+            except BaseException:
+                # The connection state is unknown: drop it instead of returning it to the pool
+                writer.close()
+                raise
+            self._idle.append((reader, writer))
+            return response
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for _, writer in idle:
+            writer.close()
+            with contextlib.suppress(ConnectionResetError, BrokenPipeError):
+                await writer.wait_closed()
+
+
+class SubmissionClient:
+    """Remote counterpart of the in-process Student/Instructor calls."""
+
+    def __init__(self, pool):
+        self.pool = pool
+        self._instructor_key = None
+
+    async def _in_thread(self, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+    async def instructor_key(self):
+        if self._instructor_key is None:
+            response = await self.pool.request({"op": "instructor_key"})
+            self._instructor_key = response["public_key_pem"].encode('ascii')
+        return self._instructor_key
+
+    async def request_anonymous_id(self, student):
+        """Obtain an anonymous ID for a student; returns True on success."""
+        request_json, signature, public_key_pem = await self._in_thread(student.build_anonymous_id_request)
+        response = await self.pool.request({
+            "op": "request_anonymous_id",
+            "request_json": request_json,
+            "signature": b64(signature),
+            "public_key_pem": public_key_pem.decode('ascii'),
+        })
+        result = (unb64(response["encrypted_aid"]), unb64(response["signature"])) if response["ok"] else None
+        return await self._in_thread(student.accept_anonymous_id, result, await self.instructor_key())
+
+    async def submit_work(self, student, content):
+        """Submit a student's work; returns True if the instructor accepted it."""
+        request = await self._in_thread(student.build_submission, content)
+        if request is None:
+            return False
+        submission_str, signature, public_key_pem = request
+        response = await self.pool.request({
+            "op": "submit",
+            "submission_str": submission_str,
+            "signature": b64(signature),
+            "public_key_pem": public_key_pem.decode('ascii'),
+        })
+        return response["ok"]
+
+    async def grades(self):
+        response = await self.pool.request({"op": "grades"})
+        return response["grades"]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_load(pool, students, total_requests, concurrency):
+    """
+    Drive the server with `concurrency` concurrent clients until total_requests are done.
+
+    Every client cycles through anonymous-ID requests, submissions and grade
+    queries for its students; a student without an anonymous ID requests one
+    before submitting. Returns (latencies per op in seconds, wall time, failures).
+    """
+    client = SubmissionClient(pool)
+    await client.instructor_key()
+    latencies = {"request_anonymous_id": [], "submit": [], "grades": []}
+    failures = 0
+    remaining = total_requests
+
+    async def worker(index):
+        nonlocal remaining, failures
+        step = 0
+        while remaining > 0:
+            remaining -= 1
+            student = students[(index + step * concurrency) % len(students)]
+            op = ("request_anonymous_id", "submit", "grades")[step % 3]
+            if op == "submit" and student.anonymous_id is None:
+                op = "request_anonymous_id"
+            step += 1
+            start = time.perf_counter()
+            try:
+                if op == "request_anonymous_id":
+                    ok = await client.request_anonymous_id(student)
+                elif op == "submit":
+                    ok = await client.submit_work(student, f"Load test submission {step} from {student.student_id}")
+                else:
+                    ok = await client.grades() is not None
+            except (ConnectionError, OSError, asyncio.IncompleteReadError, ValueError):
+                # A dropped connection fails this request only; the pool replaces it
+                ok = False
+            latencies[op].append(time.perf_counter() - start)
+            failures += not ok
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, time.perf_counter() - start, failures
+
+
+def print_load_report(latencies, wall_time, failures):
+    everything = sorted(t for times in latencies.values() for t in times)
+    print(f"\n[Load] {len(everything)} requests in {wall_time:.2f} s: "
+          f"{len(everything) / wall_time:,.1f} requests/s, {failures} failed")
+    rows = [("all", everything)] + [(op, sorted(times)) for op, times in latencies.items() if times]
+    for op, times in rows:
+        print(f"    -> {op:<22} n={len(times):<6} p50 {percentile(times, 0.50) * 1000:8.2f} ms  "
+              f"p95 {percentile(times, 0.95) * 1000:8.2f} ms  p99 {percentile(times, 0.99) * 1000:8.2f} ms  "
+              f"max {times[-1] * 1000:8.2f} ms  mean {statistics.fmean(times) * 1000:8.2f} ms")
+
+
+async def serve(args):
+    gradebook = SQLiteGradebook(args.gradebook) if args.gradebook else None
+    instructor = Instructor("Professor Smith", gradebook=gradebook)
+    server = SubmissionServer(instructor, max_workers=args.workers)
+    listener = await server.start(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"[Server] Serving instructor {instructor.name} on {where}")
+    with contextlib.ExitStack() as stack:
+        if args.quiet:
+            devnull = stack.enter_context(open(os.devnull, "w"))
+            stack.enter_context(contextlib.redirect_stdout(devnull))
+        async with listener:
+            await listener.serve_forever()
+
+
+async def load(args):
+    server = None
+    if args.spawn:
+        # Same process, but the handlers still run on the server's own thread pool
+        server = SubmissionServer(Instructor("Professor Smith"), max_workers=args.workers)
+        await server.start(args.host, args.port, args.unix)
+
+    print(f"[Load] Generating keys for {args.students} students...")
+    students = await asyncio.get_running_loop().run_in_executor(
+        None, lambda: [Student(f"Student {i}", f"L{i:05d}") for i in range(args.students)])
+
+    pool = ConnectionPool(args.host, args.port, args.unix, size=args.connections)
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        latencies, wall_time, failures = await run_load(pool, students, args.requests, args.clients)
+    await pool.close()
+    if server is not None:
+        await server.stop()
+    print_load_report(latencies, wall_time, failures)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Network front-end for the anonymous submission protocol")
+    parser.add_argument("mode", choices=["serve", "load"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="Unix socket path (instead of TCP)")
+    parser.add_argument("--workers", type=int, default=None, help="server thread pool size")
+    parser.add_argument("--gradebook", help="serve mode: keep the instructor's records in this SQLite file")
+    parser.add_argument("--quiet", action="store_true", help="silence per-request protocol output")
+    parser.add_argument("--spawn", action="store_true", help="load mode: run the server in this process")
+    parser.add_argument("--clients", type=int, default=16, help="load mode: concurrent clients")
+    parser.add_argument("--connections", type=int, default=8, help="load mode: pooled connections")
+    parser.add_argument("--requests", type=int, default=600, help="load mode: total requests")
+    parser.add_argument("--students", type=int, default=16, help="load mode: distinct student keys")
+    args = parser.parse_args(argv)
+
+    if args.mode == "serve":
+        asyncio.run(serve(args))
+    else:
+        asyncio.run(load(args))
+
+if __name__ == "__main__":
+    main()
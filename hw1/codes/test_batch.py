@@ -0,0 +1,65 @@
+import random
+import unittest
+
+import numpy as np
+
+from rsa_toolkit import batch
+
+
+class TestBatchModexp(unittest.TestCase):
+
+    def moduli(self, bits):
+        rng = random.Random(bits)
+        top = 1 << bits
+        moduli = [top - 1, (top >> 1) + 1]
+        moduli += [rng.randrange(top >> 1, top) | 1 for _ in range(4)]
+        return moduli
+
+    def bases(self, n):
+        rng = random.Random(n)
+        # Bases above n (up to 2^64 - 1) are reduced first
+        edges = [0, 1, 2, n - 2, n - 1, n, n + 1, (1 << 64) - 1]
+        return [b for b in edges if b < 1 << 64] + [rng.randrange(1 << 64) for _ in range(64)]
+
+    def check(self, bits):
+        rng = random.Random(-bits)
+        exponents = [0, 1, 2, 3, 65537, (1 << 64) - 1, rng.getrandbits(bits)]
+        for n in self.moduli(bits):
+            self.assertEqual(n.bit_length(), bits)
+            self.assertTrue(batch.supports_modulus(n))
+            bases = self.bases(n)
+            for e in exponents:
+                result = batch.batch_modexp(np.array(bases, dtype=np.uint64), e, n)
+                self.assertEqual(result.dtype, np.uint64)
+                self.assertEqual([int(r) for r in result], [pow(b, e, n) for b in bases], f"n={n}, e={e}")
+
+    def test_31_bits(self):
+        self.check(31)
+
+    def test_32_bits(self):
+        self.check(32)
+
+    def test_33_bits(self):
+        self.check(33)
+
+    def test_63_bits(self):
+        self.check(63)
+
+    def test_64_bits(self):
+        self.check(64)
+
+    def test_even_moduli_up_to_32_bits(self):
+        for n in (2, 10, (1 << 31) + 2, (1 << 32) - 2):
+            bases = self.bases(n)
+            result = batch.batch_modexp(np.array(bases, dtype=np.uint64), 65537, n)
+            self.assertEqual([int(r) for r in result], [pow(b, 65537, n) for b in bases])
+
+    def test_unsupported_moduli_are_rejected(self):
+        for n in (1, 1 << 64, (1 << 64) + 1, (1 << 40) + 2):
+            self.assertFalse(batch.supports_modulus(n))
+            with self.assertRaises(ValueError):
+                batch.batch_modexp(np.array([3], dtype=np.uint64), 3, n)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+import os
+import random
+import unittest
+
+from rsa_toolkit import blocks, keygen
+
+
+class TestBlocks(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.public_key, cls.private_key = keygen.generate_keypair(64, rng=random.Random(8))
+        cls.n = cls.public_key[1]
+        cls.k = blocks.plaintext_block_size(cls.n)
+        cls.out_size = blocks.ciphertext_block_size(cls.n)
+
+    def test_block_count(self):
+        for size in (0, 1, self.k - blocks.LENGTH_BYTES, self.k - blocks.LENGTH_BYTES + 1, 4 * self.k):
+            ciphertext = blocks.encrypt_bytes(os.urandom(size), self.public_key)
+            self.assertEqual(len(ciphertext), blocks.block_count(size, self.n) * self.out_size)
+
+    def test_block_above_modulus_is_rejected(self):
+        ciphertext = blocks.encrypt_bytes(b"payload", self.public_key)
+        too_big = b"\xff" * self.out_size + ciphertext[self.out_size:]
+        with self.assertRaises(ValueError):
+            blocks.decrypt_bytes(too_big, self.private_key)
+
+    def test_block_decrypting_past_k_bytes_is_rejected(self):
+        e, n = self.public_key
+        block = blocks.encrypt_block((n - 1).to_bytes(self.out_size, "big"), e, n, self.out_size)
+        with self.assertRaises(ValueError):
+            blocks.decrypt_block(block, self.private_key, self.k)
+
+    def test_corrupted_ciphertext_never_overflows(self):
+        data = os.urandom(3 * self.k)
+        ciphertext = blocks.encrypt_bytes(data, self.public_key)
+        rng = random.Random(1)
+        for _ in range(200):
+            corrupted = bytearray(ciphertext)
+            corrupted[rng.randrange(len(corrupted))] ^= 1 << rng.randrange(8)
+            try:
+                self.assertNotEqual(blocks.decrypt_bytes(bytes(corrupted), self.private_key), data)
+            except ValueError:
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main()
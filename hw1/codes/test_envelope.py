@@ -0,0 +1,116 @@
+import os
+import tempfile
+import unittest
+
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from rsa_toolkit import envelope
+
+CHUNK_SIZE = 16
+RECORD_SIZE = CHUNK_SIZE + envelope.TAG_BYTES
+
+
+class TestEnvelope(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        cls.public_key = cls.private_key.public_key()
+        cls.header_size = (len(envelope.MAGIC) + 2 + cls.public_key.key_size // 8
+                           + 4 + envelope.NONCE_PREFIX_BYTES)
+
+    def seal(self, data):
+        return envelope.seal(data, self.public_key, CHUNK_SIZE)
+
+    def open(self, data):
+        return envelope.open_envelope(data, self.private_key)
+
+    def records(self, sealed):
+        body = sealed[self.header_size:]
+        return [body[i:i + RECORD_SIZE] for i in range(0, len(body), RECORD_SIZE)]
+
+    def test_round_trip(self):
+        for size in (0, 1, CHUNK_SIZE - 1, CHUNK_SIZE, CHUNK_SIZE + 1, 5 * CHUNK_SIZE, 5 * CHUNK_SIZE + 3):
+            data = os.urandom(size)
+            sealed = self.seal(data)
+            self.assertTrue(envelope.is_envelope(sealed))
+            self.assertEqual(self.open(sealed), data, f"size {size}")
+
+    def test_empty_payload_has_one_final_record(self):
+        sealed = self.seal(b"")
+        self.assertEqual(len(sealed), self.header_size + envelope.TAG_BYTES)
+
+    def test_stream_round_trip_with_uneven_chunks(self):
+        data = os.urandom(7 * CHUNK_SIZE + 5)
+        pieces = [data[:3], data[3:40], data[40:]]
+        sealed = b"".join(envelope.seal_stream(pieces, self.public_key, CHUNK_SIZE))
+        # Feed the envelope back a few bytes at a time
+        chunks = [sealed[i:i + 7] for i in range(0, len(sealed), 7)]
+        self.assertEqual(b"".join(envelope.open_stream(chunks, self.private_key)), data)
+
+    def test_file_round_trip(self):
+        data = os.urandom(3 * envelope.ENVELOPE_CHUNK_SIZE + 11)
+        with tempfile.TemporaryDirectory() as directory:
+            src = os.path.join(directory, "plain")
+            sealed = os.path.join(directory, "sealed")
+            opened = os.path.join(directory, "opened")
+            with open(src, "wb") as f:
+                f.write(data)
+            envelope.seal_file(src, sealed, self.public_key, chunk_size=1000)
+            self.assertEqual(envelope.open_file(sealed, opened, self.private_key, chunk_size=1000), len(data))
+            with open(opened, "rb") as f:
+                self.assertEqual(f.read(), data)
+
+    def test_truncation_at_record_boundary_is_detected(self):
+        sealed = self.seal(os.urandom(4 * CHUNK_SIZE))
+        records = self.records(sealed)
+        self.assertEqual(len(records), 4)
+        for kept in range(1, len(records)):
+            truncated = sealed[:self.header_size] + b"".join(records[:kept])
+            with self.assertRaises(InvalidTag):
+                self.open(truncated)
+
+    def test_truncation_inside_record_is_detected(self):
+        sealed = self.seal(os.urandom(4 * CHUNK_SIZE))
+        with self.assertRaises(InvalidTag):
+            self.open(sealed[:-1])
+
+    def test_truncation_of_header_is_detected(self):
+        sealed = self.seal(b"payload")
+        for size in (0, len(envelope.MAGIC), self.header_size - 1, self.header_size):
+            with self.assertRaises(ValueError):
+                self.open(sealed[:size])
+
+    def test_reordered_records_are_detected(self):
+        sealed = self.seal(os.urandom(4 * CHUNK_SIZE))
+        records = self.records(sealed)
+        records[0], records[1] = records[1], records[0]
+        with self.assertRaises(InvalidTag):
+            self.open(sealed[:self.header_size] + b"".join(records))
+
+    def test_records_from_another_envelope_are_rejected(self):
+        data = os.urandom(2 * CHUNK_SIZE)
+        first, second = self.seal(data), self.seal(data)
+        with self.assertRaises(InvalidTag):
+            self.open(first[:self.header_size] + second[self.header_size:])
+
+    def test_tampering_is_detected(self):
+        sealed = self.seal(os.urandom(3 * CHUNK_SIZE))
+        # Chunk size, nonce prefix, first record, last tag
+        for offset in (self.header_size - envelope.NONCE_PREFIX_BYTES - 1, self.header_size - 1,
+                       self.header_size, len(sealed) - 1):
+            tampered = bytearray(sealed)
+            tampered[offset] ^= 0x01
+            with self.assertRaises((InvalidTag, ValueError)):
+                self.open(bytes(tampered))
+
+    def test_bad_magic_is_rejected(self):
+        sealed = bytearray(self.seal(b"payload"))
+        sealed[0] ^= 0x01
+        with self.assertRaises(ValueError):
+            self.open(bytes(sealed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import tempfile
+import unittest
+
+from rsa_toolkit.gradebook import MemoryGradebook, SQLiteGradebook
+
+
+def fill(gradebook):
+    """Run the same registrations, submissions and grading on a gradebook."""
+    for i in range(7):
+        student_id = f"student-{i}"
+        gradebook.registered_students[student_id] = f"fingerprint-{i}"
+        gradebook.issue_anonymous_id(student_id, f"aid-{i}")
+        if i != 6:
+            gradebook.submissions[f"aid-{i}"] = {"submission": {"answer": i, "files": ["a", "b"]},
+                                                 "grade": None, "signature": f"sig-{i}"}
+    # student-5 was reissued an anonymous ID after submitting with the old one
+    gradebook.issue_anonymous_id("student-5", "aid-new-5")
+    gradebook.submissions["aid-new-5"] = {"submission": {"answer": 55}, "grade": None, "signature": "sig-new-5"}
+
+    graded = gradebook.set_grades([("aid-0", 90), ("aid-1", 75.5), ("aid-5", 10), ("aid-new-5", 60), ("missing", 1)])
+    assert graded == 4, graded
+    assert gradebook.set_grade("aid-2", 40)
+    assert not gradebook.set_grade("missing", 40)
+    return gradebook.publish()
+
+
+def snapshot(gradebook, page_size=2):
+    """Everything a gradebook holds, in a backend-independent order."""
+    return {
+        "registered": sorted(gradebook.registered_students.items()),
+        "student_aid": sorted(gradebook.student_aid_map.items()),
+        "aid_student": sorted(gradebook.aid_student_map.items()),
+        "submissions": sorted(gradebook.iter_submissions(page_size=page_size)),
+        "ungraded": sorted(gradebook.iter_submissions(ungraded=True, page_size=page_size)),
+        "published": sorted(gradebook.published_grades.items()),
+        "final": sorted(gradebook.iter_final_grades(page_size=page_size)),
+    }
+
+
+class TestGradebook(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "gradebook.sqlite3")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sqlite_matches_memory(self):
+        memory = MemoryGradebook()
+        sqlite = SQLiteGradebook(self.path, page_size=2)
+        try:
+            self.assertEqual(fill(sqlite), fill(memory))
+            expected = snapshot(memory)
+            self.assertEqual(snapshot(sqlite), expected)
+            self.assertEqual(len(sqlite.submissions), len(memory.submissions))
+            self.assertEqual(sqlite.submissions["aid-1"], memory.submissions["aid-1"])
+            self.assertIn("aid-3", sqlite.submissions)
+            self.assertNotIn("missing", sqlite.submissions)
+        finally:
+            sqlite.close()
+
+    def test_final_grades_follow_current_anonymous_id(self):
+        memory = MemoryGradebook()
+        fill(memory)
+        final = sorted(memory.iter_final_grades())
+        self.assertIn(("student-5", "aid-new-5", 60), final)
+        self.assertNotIn(("student-5", "aid-5", 10), final)
+        self.assertEqual([row[0] for row in final], ["student-0", "student-1", "student-2", "student-5"])
+
+    def test_sqlite_survives_reopen(self):
+        memory = MemoryGradebook()
+        fill(memory)
+        sqlite = SQLiteGradebook(self.path)
+        fill(sqlite)
+        sqlite.close()
+
+        reopened = SQLiteGradebook(self.path, page_size=3)
+        try:
+            self.assertEqual(snapshot(reopened), snapshot(memory))
+            # Further grading on the reopened database
+            self.assertTrue(reopened.set_grade("aid-3", 88))
+            self.assertTrue(memory.set_grade("aid-3", 88))
+            self.assertEqual(reopened.publish(), memory.publish())
+        finally:
+            reopened.close()
+
+        reopened = SQLiteGradebook(self.path)
+        try:
+            self.assertEqual(snapshot(reopened), snapshot(memory))
+        finally:
+            reopened.close()
+
+    def test_sqlite_deletes_and_pages(self):
+        sqlite = SQLiteGradebook(self.path, page_size=1)
+        try:
+            fill(sqlite)
+            del sqlite.registered_students["student-6"]
+            with self.assertRaises(KeyError):
+                del sqlite.registered_students["student-6"]
+            with self.assertRaises(KeyError):
+                sqlite.registered_students["student-6"]
+            self.assertEqual(list(sqlite.registered_students), [f"student-{i}" for i in range(6)])
+        finally:
+            sqlite.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import math
+import random
+import unittest
+
+from rsa_toolkit import calibration, factorization, keygen, planner
+
+
+def factorization_step(public_key):
+    steps = [step for step in planner.plan(public_key) if step["attack"] == "factorization"]
+    return steps[0] if steps else None
+
+
+class TestPlannerFactorization(unittest.TestCase):
+
+    def keypair(self, bits):
+        return keygen.generate_keypair(bits, rng=random.Random(bits))
+
+    def test_small_moduli_cost_trial_division(self):
+        public_key, _ = self.keypair(12)
+        n = public_key[1]
+        self.assertEqual(factorization.select_strategies(n), ["trial_division"])
+        step = factorization_step(public_key)
+        self.assertAlmostEqual(step["log10_cost"], calibration.log10_trial_division_ops(n.bit_length()))
+        self.assertIn("trial_division", step["model"])
+
+    def test_mid_size_moduli_include_rho(self):
+        public_key, _ = self.keypair(32)
+        n = public_key[1]
+        step = factorization_step(public_key)
+        self.assertIn("pollard_rho", step["model"])
+        self.assertGreaterEqual(step["log10_cost"], math.log10(factorization.rho_expected_iterations(n)))
+
+    def test_out_of_budget_moduli_are_not_planned(self):
+        public_key, _ = self.keypair(64)
+        self.assertNotIn("pollard_rho", factorization.select_strategies(public_key[1]))
+        self.assertIsNone(factorization_step(public_key))
+        self.assertIn("exhaustive", [step["attack"] for step in planner.plan(public_key)])
+
+    def test_planned_factorization_recovers_the_plaintext(self):
+        public_key, _ = self.keypair(24)
+        e, n = public_key
+        result = planner.cheapest_attack(pow(123456, e, n), public_key, domain=None,
+                                          include=("factorization", "exhaustive"))
+        self.assertEqual(result["plaintext"], 123456)
+        self.assertEqual(result["attack"], "factorization")
+
+
+if __name__ == "__main__":
+    unittest.main()
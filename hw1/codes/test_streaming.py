@@ -0,0 +1,85 @@
+import os
+import random
+import tempfile
+import unittest
+
+from rsa_toolkit import blocks, keygen, streaming
+
+
+class TestBlockStreaming(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.public_key, cls.private_key = keygen.generate_keypair(64, rng=random.Random(418))
+        n = cls.public_key[1]
+        cls.k = blocks.plaintext_block_size(n)
+        cls.out_size = blocks.ciphertext_block_size(n)
+
+    def sizes(self):
+        """0 bytes, and payloads whose framed length ends exactly on (or next to) a block boundary."""
+        k, header = self.k, blocks.LENGTH_BYTES
+        sizes = {0, 1, k - header - 1, k - header, k - header + 1, k, 2 * k - header, 3 * k - header, 3 * k}
+        return sorted(size for size in sizes if size >= 0)
+
+    def test_block_sizes(self):
+        n = self.public_key[1]
+        self.assertLess(256 ** self.k, n)
+        self.assertLess(n, 256 ** self.out_size)
+
+    def test_bytes_round_trip(self):
+        for size in self.sizes():
+            data = os.urandom(size)
+            ciphertext = blocks.encrypt_bytes(data, self.public_key)
+            blocks_needed = -(-(size + blocks.LENGTH_BYTES) // self.k)
+            self.assertEqual(len(ciphertext), blocks_needed * self.out_size, f"size {size}")
+            self.assertEqual(blocks.decrypt_bytes(ciphertext, self.private_key), data, f"size {size}")
+
+    def test_stream_matches_bytes(self):
+        for size in self.sizes():
+            data = os.urandom(size)
+            pieces = [data[i:i + 5] for i in range(0, size, 5)]
+            ciphertext = b"".join(streaming.encrypt_stream(pieces, size, self.public_key))
+            self.assertEqual(ciphertext, blocks.encrypt_bytes(data, self.public_key), f"size {size}")
+            chunks = [ciphertext[i:i + 7] for i in range(0, len(ciphertext), 7)]
+            self.assertEqual(b"".join(streaming.decrypt_stream(chunks, self.private_key)), data, f"size {size}")
+
+    def test_file_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            src = os.path.join(directory, "plain")
+            encrypted = os.path.join(directory, "encrypted")
+            decrypted = os.path.join(directory, "decrypted")
+            for size in self.sizes():
+                data = os.urandom(size)
+                with open(src, "wb") as f:
+                    f.write(data)
+                # Chunks on, below and across the block sizes
+                for chunk_size in (1, self.k, self.out_size, self.k + 3, streaming.DEFAULT_CHUNK_SIZE):
+                    written = streaming.encrypt_file(src, encrypted, self.public_key, chunk_size)
+                    self.assertEqual(written, os.path.getsize(encrypted))
+                    self.assertEqual(streaming.decrypt_file(encrypted, decrypted, self.private_key, chunk_size), size)
+                    with open(decrypted, "rb") as f:
+                        self.assertEqual(f.read(), data, f"size {size}, chunk size {chunk_size}")
+
+    def test_file_chunks_without_mmap(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "plain")
+            data = os.urandom(3 * self.k)
+            with open(path, "wb") as f:
+                f.write(data)
+            for use_mmap in (True, False):
+                chunks = list(streaming.iter_file_chunks(path, self.k, use_mmap=use_mmap))
+                self.assertEqual([len(chunk) for chunk in chunks], [self.k] * 3)
+                self.assertEqual(b"".join(chunks), data)
+
+    def test_truncated_ciphertext_is_rejected(self):
+        ciphertext = blocks.encrypt_bytes(os.urandom(3 * self.k), self.public_key)
+        with self.assertRaises(ValueError):
+            blocks.decrypt_bytes(ciphertext[:-1], self.private_key)
+        with self.assertRaises(ValueError):
+            b"".join(streaming.decrypt_stream([ciphertext[:-1]], self.private_key))
+        with self.assertRaises(ValueError):
+            b"".join(streaming.decrypt_stream([ciphertext[:-self.out_size]], self.private_key))
+
+
+if __name__ == "__main__":
+    unittest.main()
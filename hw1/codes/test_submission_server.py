@@ -0,0 +1,66 @@
+import asyncio
+import json
+import unittest
+
+from submission_server import HEADER, MAX_FRAME, read_frame
+
+
+def reader_for(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+def frame(body):
+    return HEADER.pack(len(body)) + body
+
+
+class TestReadFrame(unittest.IsolatedAsyncioTestCase):
+
+    async def test_whole_frames(self):
+        reader = reader_for(frame(b'{"op": "ping"}') + frame(b"[1, 2]"))
+        self.assertEqual(await read_frame(reader), {"op": "ping"})
+        self.assertEqual(await read_frame(reader), [1, 2])
+        self.assertIsNone(await read_frame(reader))
+
+    async def test_eof_inside_header(self):
+        self.assertIsNone(await read_frame(reader_for(b"")))
+        self.assertIsNone(await read_frame(reader_for(frame(b"{}")[:HEADER.size - 1])))
+
+    async def test_eof_inside_body(self):
+        body = json.dumps({"op": "submit", "submission_str": "x" * 100}).encode()
+        self.assertIsNone(await read_frame(reader_for(frame(body)[:-1])))
+
+    async def test_oversized_frame(self):
+        with self.assertRaises(ValueError):
+            await read_frame(reader_for(HEADER.pack(MAX_FRAME + 1)))
+
+
+class TestServerConnection(unittest.IsolatedAsyncioTestCase):
+
+    async def test_truncated_request_closes_the_connection_cleanly(self):
+        from submission_server import SubmissionServer
+
+        class Stub:
+            name = "stub"
+
+        server = SubmissionServer(Stub(), max_workers=1)
+        listener = await server.start("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(frame(b'{"op": "ping"}')[:-3])
+            await writer.drain()
+            writer.write_eof()
+            # The server closes its side without answering
+            self.assertEqual(await asyncio.wait_for(reader.read(), 5), b"")
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            await server.stop()
+        self.assertEqual(server.requests, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import json
+import unittest
+
+from anonymous_submission_protocol import Instructor, Student
+
+
+class TestBatchSubmissions(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.instructor = Instructor("Instructor")
+        cls.alice = Student("Alice", "S001")
+        cls.bob = Student("Bob", "S002")
+        for student in (cls.alice, cls.bob):
+            cls.instructor.register_student(student.student_id, student.get_public_key_pem())
+            assert student.request_anonymous_id(cls.instructor)
+
+    def signed(self, student, submission_str):
+        """A batch item for any string, validly signed by the student."""
+        return submission_str, student.sign_message(submission_str), student.get_public_key_pem()
+
+    def test_mixed_batch(self):
+        good = self.alice.build_submission("Alice's homework")
+        other = self.bob.build_submission("Bob's homework")
+        bad_signature = (good[0], self.bob.sign_message(good[0]), good[2])
+        batch = [
+            good,
+            self.signed(self.bob, "not json {"),
+            bad_signature,
+            self.signed(self.bob, json.dumps({"content": "no anonymous ID"})),
+            self.signed(self.bob, json.dumps(["a", "list"])),
+            self.signed(self.bob, json.dumps({"anonymous_id": ["not", "a", "string"]})),
+            self.signed(self.bob, json.dumps({"anonymous_id": "unknown"})),
+            # Bob's own key cannot submit under Alice's anonymous ID
+            self.signed(self.bob, json.dumps({"anonymous_id": self.alice.anonymous_id})),
+            other,
+        ]
+        results = self.instructor.receive_submissions(batch)
+        self.assertEqual(results, [True, False, False, False, False, False, False, False, True])
+        self.assertEqual(self.instructor.submissions[self.alice.anonymous_id]["submission"]["content"],
+                         "Alice's homework")
+        self.assertEqual(self.instructor.submissions[self.bob.anonymous_id]["submission"]["content"],
+                         "Bob's homework")
+        self.assertNotIn("unknown", self.instructor.submissions)
+
+    def test_single_malformed_submission(self):
+        self.assertFalse(self.instructor.receive_submission(*self.signed(self.alice, "not json {")))
+        self.assertFalse(self.instructor.receive_submission(*self.signed(self.alice, "{}")))
+
+    def test_empty_batch(self):
+        self.assertEqual(self.instructor.receive_submissions([]), [])
+
+
+if __name__ == "__main__":
+    unittest.main()